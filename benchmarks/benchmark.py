@@ -0,0 +1,314 @@
+"""
+Benchmark the Toon boilerstatus hot path against a local mock Toon.
+
+Starts an aiohttp server that serves synthetic boilerstatus/boilervalues.txt
+payloads and drives ToonBoilerStatusData, BoilerStatusDecoder and
+ToonBoilerStatusSensor through N hosts x M ticks.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.benchmark --hosts 50 --ticks 20 --latency 20
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.toon_boilerstatus.coordinator import ToonBoilerStatusData
+from custom_components.toon_boilerstatus.decoder import BoilerStatusDecoder
+from custom_components.toon_boilerstatus.sensor import (
+    SENSOR_TYPES,
+    ToonBoilerStatusSensor,
+)
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+PAYLOAD_FIELDS = {
+    "boilerSetpoint": (20.0, 70.0),
+    "boilerInTemp": (20.0, 60.0),
+    "boilerOutTemp": (20.0, 75.0),
+    "boilerPressure": (1.2, 2.0),
+    "boilerModulationLevel": (0.0, 100.0),
+    "roomTemp": (17.0, 22.0),
+    "roomTempSetpoint": (15.0, 21.0),
+}
+
+
+def make_payload(sample, payload_size):
+    """Return a synthetic boilervalues.txt body of at least payload_size bytes."""
+
+    sample_time = time.localtime(time.time() + sample)
+    data = {"sampleTime": time.strftime("%d-%m-%Y %H:%M:%S", sample_time)}
+    for field, (low, high) in PAYLOAD_FIELDS.items():
+        data[field] = f"{random.uniform(low, high):.2f}"
+    body = json.dumps(data)
+    padding = 0
+    while len(body) < payload_size:
+        data[f"extra{padding}"] = "0" * 32
+        padding += 1
+        body = json.dumps(data)
+    return body
+
+
+async def start_mock_toon(args):
+    """Start the mock Toon and return the runner and its port."""
+
+    counter = 0
+
+    async def handle(request):
+        nonlocal counter
+        delay = args.latency + random.uniform(-args.jitter, args.jitter)
+        await asyncio.sleep(max(0.0, delay) / 1000)
+        if random.random() < args.error_rate:
+            raise web.HTTPInternalServerError()
+        counter += 1
+        return web.Response(
+            text=make_payload(counter, args.payload_size), content_type="text/plain"
+        )
+
+    app = web.Application()
+    app.router.add_get("/boilerstatus/boilervalues.txt", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port
+
+
+class BenchCoordinator:
+    """Stand-in for the coordinator that only carries the latest snapshot."""
+
+    def __init__(self):
+        """Initialize the stand-in."""
+
+        self.data = None
+        self.last_update_success = True
+        self.statistics = None
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked past a short sleep."""
+
+    def __init__(self, interval=0.001):
+        """Initialize the monitor."""
+
+        self.interval = interval
+        self.max_block = 0.0
+        self.total_block = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            block = loop.time() - start - self.interval
+            if block > 0:
+                self.total_block += block
+                self.max_block = max(self.max_block, block)
+
+    def start(self):
+        """Start monitoring."""
+
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """Stop monitoring."""
+
+        self._task.cancel()
+
+
+class BenchHost:
+    """One simulated Toon with its fetcher, coordinator stand-in and sensors."""
+
+    def __init__(self, port, decoder, args):
+        """Initialize the host."""
+
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=1)
+        )
+        self.toon = ToonBoilerStatusData(self.session, "127.0.0.1", port)
+        self.decoder = decoder
+        self.coordinator = BenchCoordinator()
+        self.sensors = [
+            ToonBoilerStatusSensor(
+                "Bench ", description, self.coordinator, timedelta(minutes=15)
+            )
+            for description in SENSOR_TYPES
+        ]
+        self.writes = 0
+        for sensor in self.sensors:
+            sensor.async_write_ha_state = self._writer(sensor)
+
+    def _writer(self, sensor):
+        def _write():
+            sensor._remember_written()
+            self.writes += 1
+
+        return _write
+
+
+IMPORT_TIME_SCRIPT = """
+import time
+import homeassistant.components.sensor
+import homeassistant.helpers.update_coordinator
+start = time.perf_counter()
+import custom_components.toon_boilerstatus.sensor
+print(time.perf_counter() - start)
+"""
+
+
+def measure_import_time(runs=5):
+    """Return the best time to import the sensor platform in a fresh process.
+
+    The Home Assistant modules that are always loaded before a platform are
+    imported first, so only the integration's own import cost is measured.
+    """
+
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", IMPORT_TIME_SCRIPT],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    )
+
+
+async def measure_fetch_allocations(host, samples=50):
+    """Return the mean peak of memory allocated by one fetch and decode."""
+
+    total = 0
+    for _ in range(samples):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            payload = await host.toon.async_fetch()
+        except UpdateFailed:
+            continue
+        if payload is not None:
+            host.decoder.decode(payload)
+        total += tracemalloc.get_traced_memory()[1] - current
+    return total / samples
+
+
+def measure_snapshot_memory(decoder, payload, samples=1000):
+    """Return the bytes kept alive by one snapshot and by the same values as a dict.
+
+    Both hold the same float objects, so the difference is the container.
+    """
+
+    decoder.decode(payload)
+    tracemalloc.start()
+    snapshots = [decoder.decode(payload) for _ in range(samples)]
+    snapshot_size = tracemalloc.get_traced_memory()[0] / samples
+    dicts = [snapshot.as_dict() for snapshot in snapshots]
+    dict_size = tracemalloc.get_traced_memory()[0] / samples - snapshot_size
+    tracemalloc.stop()
+    del snapshots, dicts
+    return snapshot_size, dict_size
+
+
+async def run(args):
+    """Run the benchmark and print the results."""
+
+    runner, port = await start_mock_toon(args)
+    decoder = BoilerStatusDecoder(SENSOR_TYPES)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    hosts = [BenchHost(port, decoder, args) for _ in range(args.hosts)]
+    per_host = (tracemalloc.get_traced_memory()[0] - before) / args.hosts
+
+    fetches = errors = 0
+    parse_time = 0.0
+
+    async def tick(host):
+        nonlocal fetches, errors, parse_time
+        async with semaphore:
+            try:
+                payload = await host.toon.async_fetch()
+            except UpdateFailed:
+                errors += 1
+                return
+        fetches += 1
+        if payload is None:
+            return
+        start = time.perf_counter()
+        host.coordinator.data = decoder.decode(payload)
+        parse_time += time.perf_counter() - start
+        for sensor in host.sensors:
+            sensor._handle_coordinator_update()
+
+    monitor = LoopMonitor()
+    monitor.start()
+    collections = [stats["collections"] for stats in gc.get_stats()]
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        await asyncio.gather(*(tick(host) for host in hosts))
+    elapsed = time.perf_counter() - start
+    collections = [
+        stats["collections"] - before
+        for stats, before in zip(gc.get_stats(), collections)
+    ]
+    monitor.stop()
+    after = tracemalloc.get_traced_memory()[0]
+    fetch_allocations = await measure_fetch_allocations(hosts[0])
+    tracemalloc.stop()
+    snapshot_size, dict_size = measure_snapshot_memory(
+        decoder, json.loads(make_payload(0, args.payload_size))
+    )
+
+    for host in hosts:
+        await host.session.close()
+    await runner.cleanup()
+
+    print(f"hosts x ticks         {args.hosts} x {args.ticks}")
+    print(f"elapsed               {elapsed:.3f} s")
+    print(f"fetches/s             {fetches / elapsed:.1f}")
+    print(f"errors                {errors}")
+    print(f"decode time/fetch     {parse_time / max(fetches, 1) * 1e6:.1f} us")
+    print(f"state writes          {sum(host.writes for host in hosts)}")
+    print(f"loop blocked max      {monitor.max_block * 1000:.2f} ms")
+    print(f"loop blocked total    {monitor.total_block * 1000:.2f} ms")
+    print(f"memory/host at setup  {per_host / 1024:.1f} KiB")
+    print(f"memory/host after run {(after - before) / args.hosts / 1024:.1f} KiB")
+    print(f"peak alloc/fetch      {fetch_allocations / 1024:.1f} KiB")
+    print(f"snapshot size         {snapshot_size:.0f} B (as dict {dict_size:.0f} B)")
+    print(f"gc collections        {' / '.join(map(str, collections))} (gen 0/1/2)")
+    print(f"platform import time  {measure_import_time() * 1000:.1f} ms")
+
+
+def main():
+    """Parse the command line and run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hosts", type=int, default=10, help="number of Toons")
+    parser.add_argument("--ticks", type=int, default=10, help="polls per Toon")
+    parser.add_argument("--latency", type=float, default=5.0, help="ms per response")
+    parser.add_argument("--jitter", type=float, default=2.0, help="+/- ms latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0..1")
+    parser.add_argument(
+        "--payload-size", type=int, default=0, help="minimum body size in bytes"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="maximum fetches in flight"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,215 @@
-"""The toon_boilerstatus component."""
\ No newline at end of file
+"""The toon_boilerstatus component."""
+import secrets
+from datetime import timedelta
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_WEBHOOK_ID, Platform
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, EXPORT_FORMATS, STORE_RESOLUTIONS
+
+CONFIG_SCHEMA = cv.platform_only_config_schema(DOMAIN)
+
+PLATFORMS = [Platform.SENSOR]
+
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_QUERY_HISTORY = "query_history"
+SERVICE_EXPORT_HISTORY = "export_history"
+ATTR_SAMPLES = "samples"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_RESOLUTION = "resolution"
+RESOLUTION_AUTO = "auto"
+ATTR_FILENAME = "filename"
+ATTR_FORMAT = "format"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Optional(ATTR_SAMPLES): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RESOLUTION, default=RESOLUTION_AUTO): vol.In(
+            [RESOLUTION_AUTO, *STORE_RESOLUTIONS]
+        ),
+    }
+)
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RESOLUTION, default="raw"): vol.In(
+            list(STORE_RESOLUTIONS)
+        ),
+    }
+)
+
+
+def _auto_resolution(start, end):
+    """Pick the finest resolution that keeps the result small."""
+
+    span = timedelta(seconds=end - start)
+    if span <= timedelta(hours=6):
+        return "raw"
+    if span <= timedelta(days=7):
+        return "1m"
+    return "1h"
+
+
+async def async_setup(hass: HomeAssistant, config) -> bool:
+    """Set up the Toon boilerstatus services."""
+
+    async def _async_get_history(call: ServiceCall):
+        """Return the buffered history of one or all Toons."""
+
+        host = call.data.get(CONF_HOST)
+        coordinators = hass.data.get(DOMAIN, {}).get("coordinators", {})
+        return {
+            "hosts": {
+                coordinator_host: coordinator.history.as_dict(
+                    call.data.get(ATTR_SAMPLES)
+                )
+                for coordinator_host, coordinator in coordinators.items()
+                if coordinator.history is not None
+                and host in (None, coordinator_host, coordinator.toon.host)
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_query_history(call: ServiceCall):
+        """Return the stored history of one or all Toons in a time range."""
+
+        host = call.data.get(CONF_HOST)
+        start = dt_util.as_timestamp(call.data[ATTR_START])
+        end = dt_util.as_timestamp(call.data.get(ATTR_END, dt_util.utcnow()))
+        resolution = call.data[ATTR_RESOLUTION]
+        if resolution == RESOLUTION_AUTO:
+            resolution = _auto_resolution(start, end)
+
+        coordinators = hass.data.get(DOMAIN, {}).get("coordinators", {})
+        hosts = {}
+        for coordinator_host, coordinator in coordinators.items():
+            if coordinator.store is None or host not in (
+                None,
+                coordinator_host,
+                coordinator.toon.host,
+            ):
+                continue
+            hosts[coordinator_host] = await coordinator.store.async_query(
+                hass, start, end, resolution
+            )
+        return {"resolution": resolution, "hosts": hosts}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_export_history(call: ServiceCall):
+        """Stream the stored history of one or all Toons to a file."""
+        # pylint: disable-next=import-outside-toplevel
+        from .export import export_history
+
+        filename = hass.config.path(call.data[ATTR_FILENAME])
+        if not hass.config.is_allowed_path(filename):
+            raise HomeAssistantError(
+                f"Cannot write to '{filename}', path is not allowed"
+            )
+
+        host = call.data.get(CONF_HOST)
+        stores = {
+            coordinator_host: coordinator.store
+            for coordinator_host, coordinator in hass.data.get(DOMAIN, {})
+            .get("coordinators", {})
+            .items()
+            if coordinator.store is not None
+            and host in (None, coordinator_host, coordinator.toon.host)
+        }
+        if not stores:
+            raise HomeAssistantError(
+                "Cannot export history, no Toon has the store enabled"
+                if host is None
+                else f"Cannot export history, {host} has no store enabled"
+            )
+        for store in stores.values():
+            await store.async_flush(hass)
+
+        start = 0
+        if ATTR_START in call.data:
+            start = dt_util.as_timestamp(call.data[ATTR_START])
+        end = dt_util.as_timestamp(call.data.get(ATTR_END, dt_util.utcnow()))
+        try:
+            rows = await hass.async_add_executor_job(
+                export_history,
+                stores,
+                filename,
+                call.data[ATTR_FORMAT],
+                start,
+                end,
+                call.data[ATTR_RESOLUTION],
+            )
+        except (OSError, ValueError) as err:
+            raise HomeAssistantError(f"Cannot export history: {err}") from err
+        return {"filename": filename, "rows": rows}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        _async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a Toon from a config entry."""
+
+    if CONF_WEBHOOK_ID not in entry.data:
+        # Give every entry a random push webhook id that cannot be guessed.
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: secrets.token_hex(32)}
+        )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry and release everything its coordinator holds."""
+
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN]["entries"].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+    return unload_ok
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,85 @@
+"""Circuit breaker for unreachable Toons."""
+import logging
+import random
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop polling a Toon after repeated failures and probe it with backoff.
+
+    After threshold consecutive failures the breaker opens and no fetches are
+    made until the backoff has passed. The next fetch is a half-open probe:
+    success closes the breaker, failure opens it again with a doubled backoff.
+    """
+
+    def __init__(self, name, threshold, base_backoff, max_backoff):
+        """Initialize a closed breaker."""
+
+        self._name = name
+        self._threshold = threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+
+    def allow(self, now):
+        """Return True if a fetch may be made now."""
+
+        if self.state == STATE_OPEN:
+            if now < self.retry_at:
+                return False
+            self.state = STATE_HALF_OPEN
+        return True
+
+    def retry_in(self, now):
+        """Return the seconds until the next probe, or None if not open."""
+
+        if self.state != STATE_OPEN:
+            return None
+        return max(0.0, self.retry_at - now)
+
+    def record_success(self):
+        """Close the breaker after a successful fetch."""
+
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s is reachable again, resuming polling", self._name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+
+    def record_failure(self, now):
+        """Count a failed fetch and open the breaker when needed."""
+
+        self.failures += 1
+        if self.state != STATE_HALF_OPEN and self.failures < self._threshold:
+            return
+        backoff = min(self._max_backoff, self._base_backoff * 2**self.trips)
+        # Full jitter keeps a fleet of dead devices from probing in lockstep.
+        backoff = random.uniform(backoff / 2, backoff)
+        if self.state == STATE_CLOSED:
+            _LOGGER.warning(
+                "%s failed %d times in a row, retrying in %.0fs",
+                self._name,
+                self.failures,
+                backoff,
+            )
+        self.state = STATE_OPEN
+        self.trips += 1
+        self.retry_at = now + backoff
+
+    def as_dict(self):
+        """Return the breaker state."""
+
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+        }
@@ -0,0 +1,77 @@
+"""Dedicated HTTP client sessions for the Toon boilerstatus component."""
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+
+DNS_CACHE_TTL = 300
+
+
+class ConnectionStats:
+    """Count how often connections to a Toon are opened and reused."""
+
+    __slots__ = ("created", "reused")
+
+    def __init__(self):
+        """Initialize the counters."""
+
+        self.created = 0
+        self.reused = 0
+
+    def as_dict(self):
+        """Return the counters and the reuse ratio."""
+
+        total = self.created + self.reused
+        return {
+            "connections_created": self.created,
+            "connections_reused": self.reused,
+            "reuse_ratio": round(self.reused / total, 3) if total else None,
+        }
+
+
+@callback
+def async_create_toon_session(hass, keepalive_timeout, max_connections):
+    """Return a keep-alive session for a single Toon, its stats and a closer.
+
+    The Toon's CPU is slow at TCP and HTTP setup, so every host gets its own
+    small pool of persistent connections instead of the shared HA session.
+    """
+
+    stats = ConnectionStats()
+
+    async def _on_create(session, context, params):
+        stats.created += 1
+
+    async def _on_reuse(session, context, params):
+        stats.reused += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_end.append(_on_create)
+    trace_config.on_connection_reuseconn.append(_on_reuse)
+
+    connector = aiohttp.TCPConnector(
+        limit=max_connections,
+        limit_per_host=max_connections,
+        keepalive_timeout=keepalive_timeout,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector, trace_configs=[trace_config]
+    )
+
+    remove_listener = None
+
+    async def _async_close_at_stop(_event):
+        nonlocal remove_listener
+        remove_listener = None
+        await session.close()
+
+    async def async_close():
+        if remove_listener is not None:
+            remove_listener()
+        await session.close()
+
+    remove_listener = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_CLOSE, _async_close_at_stop
+    )
+    return session, stats, async_close
@@ -0,0 +1,158 @@
+"""Config flow for the Toon boilerstatus component."""
+import logging
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant import config_entries
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_RESOURCES,
+    CONF_SCAN_INTERVAL,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_EXTRA_FIELDS,
+    CONF_HISTORY_SIZE,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PUSH,
+    CONF_STALE_AFTER,
+    CONF_STATISTICS,
+    CONF_STORE,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_NAME,
+    DEFAULT_PORT,
+    DEFAULT_STALE_AFTER,
+    DOMAIN,
+    MIN_TIME_BETWEEN_UPDATES,
+)
+from .coordinator import ToonBoilerStatusData, toon_key
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ToonBoilerStatusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """Handle a config flow for a Toon."""
+
+    VERSION = 1
+
+    async def async_step_user(self, user_input=None):
+        """Ask for the Toon to add and check that it can be reached."""
+
+        errors = {}
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            await self.async_set_unique_id(toon_key(host, user_input[CONF_PORT]))
+            self._abort_if_unique_id_configured()
+            toon = ToonBoilerStatusData(
+                async_get_clientsession(self.hass), host, user_input[CONF_PORT]
+            )
+            try:
+                await toon.async_fetch()
+            except UpdateFailed as err:
+                _LOGGER.debug("Cannot reach Toon at %s: %s", host, err)
+                errors["base"] = "cannot_connect"
+            else:
+                title = user_input[CONF_NAME].strip()
+                return self.async_create_entry(
+                    title=title,
+                    data={**user_input, CONF_NAME: f"{title} "},
+                )
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME, default=DEFAULT_NAME.strip()): str,
+                    vol.Required(CONF_HOST): str,
+                    vol.Required(CONF_PORT, default=DEFAULT_PORT): cv.port,
+                }
+            ),
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow."""
+
+        return ToonBoilerStatusOptionsFlow()
+
+
+class ToonBoilerStatusOptionsFlow(config_entries.OptionsFlow):
+    """Handle the options of a Toon."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the sensors and polling options."""
+        # pylint: disable-next=import-outside-toplevel
+        from .sensor import SENSOR_TYPES
+
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        resources = {description.key: description.name for description in SENSOR_TYPES}
+        seconds = vol.All(vol.Coerce(int), vol.Range(min=1))
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_RESOURCES,
+                        default=options.get(CONF_RESOURCES, list(resources)),
+                    ): cv.multi_select(resources),
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_SCAN_INTERVAL, MIN_TIME_BETWEEN_UPDATES.seconds
+                        ),
+                    ): seconds,
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(CONF_ADAPTIVE_POLLING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_SCAN_INTERVAL, MIN_TIME_BETWEEN_UPDATES.seconds
+                        ),
+                    ): seconds,
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL.seconds
+                        ),
+                    ): seconds,
+                    vol.Required(
+                        CONF_PUSH, default=options.get(CONF_PUSH, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_STALE_AFTER,
+                        default=options.get(
+                            CONF_STALE_AFTER, DEFAULT_STALE_AFTER.seconds
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_EXTRA_FIELDS,
+                        default=options.get(CONF_EXTRA_FIELDS, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_HISTORY_SIZE,
+                        default=options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_STATISTICS, default=options.get(CONF_STATISTICS, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_STORE, default=options.get(CONF_STORE, False)
+                    ): bool,
+                }
+            ),
+        )
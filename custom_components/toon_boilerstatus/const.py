@@ -0,0 +1,92 @@
+"""Constants for the Toon boilerstatus component."""
+from datetime import timedelta
+
+DOMAIN = "toon_boilerstatus"
+
+BASE_URL = "http://{0}:{1}/boilerstatus/boilervalues.txt"
+
+DEFAULT_NAME = "Toon "
+DEFAULT_PORT = 80
+
+MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=10)
+# Shortest poll interval accepted, the fleet scheduler divides by it.
+MIN_POLL_INTERVAL = timedelta(seconds=1)
+
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+
+DEFAULT_MAX_SCAN_INTERVAL = timedelta(minutes=5)
+
+# Sensor types whose changes mean the boiler is active and worth polling fast.
+ACTIVITY_KEYS = ("boilermodulationlevel", "boilersetpoint")
+
+CONF_KEEPALIVE_TIMEOUT = "keepalive_timeout"
+CONF_MAX_CONNECTIONS = "max_connections"
+
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_MAX_CONNECTIONS = 1
+
+CONF_DEADBAND = "deadband"
+CONF_ABSOLUTE = "absolute"
+CONF_RELATIVE = "relative"
+CONF_HEARTBEAT = "heartbeat"
+
+DEFAULT_HEARTBEAT = timedelta(minutes=15)
+
+CONF_HISTORY_SIZE = "history_size"
+
+# One hour of samples at the default scan interval.
+DEFAULT_HISTORY_SIZE = 360
+
+CONF_PUSH = "push"
+CONF_EXTRA_FIELDS = "extra_fields"
+CONF_STALE_AFTER = "stale_after"
+
+# Age of the last sample after which the BoilerStatus app is assumed to have
+# stopped writing; 0 disables the check.
+DEFAULT_STALE_AFTER = timedelta(minutes=30)
+
+# How often the age of the last sample is checked in push mode.
+STALE_CHECK_INTERVAL = timedelta(minutes=1)
+
+CONF_STATISTICS = "statistics"
+CONF_STORE = "store"
+CONF_PRESSURE_DROP_THRESHOLD = "pressure_drop_threshold"
+CONF_PRESSURE_DROP_WINDOW = "pressure_drop_window"
+
+DEFAULT_PRESSURE_DROP_WINDOW = timedelta(hours=12)
+
+EVENT_PRESSURE_DROP = "toon_boilerstatus_pressure_drop"
+
+# Windows of the rolling statistics, in seconds by attribute suffix.
+STATISTICS_WINDOWS = {"5m": 300, "1h": 3600, "24h": 86400}
+# Longest time the statistics attributes of a sensor may lag behind.
+STATISTICS_REFRESH_INTERVAL = timedelta(minutes=1)
+
+# Bucket size in seconds of every on-disk store resolution; raw holds every
+# sample. How long each resolution is kept, None keeps it forever.
+STORE_RESOLUTIONS = {"raw": None, "1m": 60, "1h": 3600}
+STORE_RETENTION = {"raw": 2 * 86400, "1m": 90 * 86400, "1h": None}
+
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+
+# Seconds to wait for a regular fetch and for a probe of an unreachable Toon.
+FETCH_TIMEOUT = 5
+PROBE_TIMEOUT = 2
+
+# Largest boilervalues.txt body accepted; the real file is a few hundred bytes.
+MAX_PAYLOAD_BYTES = 16384
+
+# Consecutive failures before a Toon is considered unreachable, and the
+# backoff range in seconds between probes while it stays unreachable.
+BREAKER_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 30
+BREAKER_MAX_BACKOFF = 900
+
+# Upper bound on simultaneous requests across all configured Toons.
+MAX_CONCURRENT_FETCHES = 4
+# Window over which the first poll of every Toon is spread after setup.
+STARTUP_POLL_WINDOW = 10
+# Fraction of the scan interval added as random jitter to each host's slot.
+POLL_JITTER = 0.05
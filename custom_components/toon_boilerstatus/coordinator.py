@@ -0,0 +1,540 @@
+"""Data fetching and update coordination for the Toon boilerstatus component."""
+import asyncio
+import logging
+import re
+import time
+
+import aiohttp
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_WEBHOOK_ID,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .breaker import STATE_HALF_OPEN, CircuitBreaker
+from .client import async_create_toon_session
+from .const import (
+    ACTIVITY_KEYS,
+    BASE_URL,
+    BREAKER_BASE_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    BREAKER_THRESHOLD,
+    CONF_ADAPTIVE_POLLING,
+    CONF_EXTRA_FIELDS,
+    CONF_HISTORY_SIZE,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_MAX_CONNECTIONS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PRESSURE_DROP_THRESHOLD,
+    CONF_PRESSURE_DROP_WINDOW,
+    CONF_PUSH,
+    CONF_STALE_AFTER,
+    CONF_STATISTICS,
+    CONF_STORE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_PORT,
+    DOMAIN,
+    EVENT_PRESSURE_DROP,
+    FETCH_TIMEOUT,
+    MAX_PAYLOAD_BYTES,
+    MIN_POLL_INTERVAL,
+    MIN_TIME_BETWEEN_UPDATES,
+    PROBE_TIMEOUT,
+    STALE_CHECK_INTERVAL,
+)
+from .decoder import BoilerStatusDecoder, json_loads
+from .derived import DerivedValues
+from .fleet import async_get_fleet
+from .metrics import FetchMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+SAMPLE_TIME_RE = re.compile(rb'"sampleTime"\s*:\s*"([^"]*)"')
+
+
+@callback
+def async_create_coordinator(hass, config, descriptions):
+    """Create the coordinator of a Toon from a validated sensor config.
+
+    The coordinator is added to the fleet, which runs its first fetch in the
+    background, or in push mode waits for payloads on its webhook instead.
+    async_shutdown() undoes everything set up here.
+    """
+    # pylint: disable=import-outside-toplevel
+
+    session, connection_stats, async_close = async_create_toon_session(
+        hass, config[CONF_KEEPALIVE_TIMEOUT], config[CONF_MAX_CONNECTIONS]
+    )
+    toon = ToonBoilerStatusData(
+        session, config[CONF_HOST], config[CONF_PORT], connection_stats
+    )
+    adaptive_bounds = None
+    if config[CONF_ADAPTIVE_POLLING]:
+        min_interval = config[CONF_MIN_SCAN_INTERVAL]
+        adaptive_bounds = (
+            min_interval,
+            max(min_interval, config[CONF_MAX_SCAN_INTERVAL]),
+        )
+    keys = [description.key for description in descriptions]
+    coordinator = ToonBoilerStatusCoordinator(
+        hass,
+        toon,
+        BoilerStatusDecoder(
+            descriptions,
+            config[CONF_EXTRA_FIELDS],
+            dt_util.get_default_time_zone(),
+        ),
+        name=f"{config[CONF_NAME]}boilerstatus",
+        poll_interval=max(
+            config.get(CONF_SCAN_INTERVAL, MIN_TIME_BETWEEN_UPDATES),
+            MIN_POLL_INTERVAL,
+        ),
+        adaptive_bounds=adaptive_bounds,
+        stale_after=config[CONF_STALE_AFTER] or None,
+        max_interval=config[CONF_MAX_SCAN_INTERVAL],
+        **_create_analytics(hass, config, toon, keys),
+    )
+    coordinator.async_on_shutdown(async_close)
+    if coordinator.store is not None:
+        coordinator.async_on_shutdown(coordinator.store.async_start(hass))
+    if config[CONF_PUSH]:
+        from .push import async_register_push
+
+        coordinator.async_on_shutdown(
+            async_register_push(hass, coordinator, config[CONF_WEBHOOK_ID])
+        )
+        if coordinator.stale_after is not None:
+            coordinator.async_on_shutdown(coordinator.async_track_stale())
+    else:
+        coordinator.async_on_shutdown(async_get_fleet(hass).async_add(coordinator))
+    hass.data.setdefault(DOMAIN, {}).setdefault("coordinators", {})[
+        toon.key
+    ] = coordinator
+    return coordinator
+
+
+def _create_analytics(hass, config, toon, keys):
+    """Create the optional analytics of a Toon as coordinator arguments.
+
+    Their modules are only imported when enabled, to keep platform import cheap.
+    """
+    # pylint: disable=import-outside-toplevel
+
+    analytics = {}
+    if config[CONF_HISTORY_SIZE]:
+        from .history import SampleHistory
+
+        analytics["history"] = SampleHistory(keys, config[CONF_HISTORY_SIZE])
+    if config[CONF_STATISTICS]:
+        from .rolling import RollingStatistics
+
+        analytics["statistics"] = RollingStatistics(keys)
+    if CONF_PRESSURE_DROP_THRESHOLD in config:
+        from .leak import PressureDropDetector
+
+        analytics["pressure_drop"] = PressureDropDetector(
+            config[CONF_PRESSURE_DROP_WINDOW].total_seconds(),
+            config[CONF_PRESSURE_DROP_THRESHOLD],
+        )
+    if config[CONF_STORE]:
+        from .store import SampleStore
+
+        analytics["store"] = SampleStore(hass.config.path(DOMAIN), toon.key, keys)
+    return analytics
+
+
+def toon_key(host, port):
+    """Return the key telling Toons on the same host apart.
+
+    It is the host when the port is the default one and host:port otherwise.
+    """
+
+    return host if port == DEFAULT_PORT else f"{host}:{port}"
+
+
+class ToonBoilerStatusData:
+    """Download boiler values from a single Toon."""
+
+    def __init__(self, session, host, port, connection_stats=None):
+        """Initialize the data object."""
+
+        self._session = session
+        self.host = host
+        self.key = toon_key(host, port)
+        self.connection_stats = connection_stats
+        self.metrics = FetchMetrics()
+        self._url = BASE_URL.format(host, port)
+        self._etag = None
+        self._last_modified = None
+        self._sample_time = None
+        self._buffer = bytearray(1024)
+
+    async def async_fetch(self, timeout=FETCH_TIMEOUT):
+        """Download and return the raw data from Toon, or None if unchanged."""
+
+        headers = {"Accept-Encoding": "identity"}
+        if self._etag is not None:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified is not None:
+            headers["If-Modified-Since"] = self._last_modified
+
+        metrics = self.metrics
+        metrics.fetches += 1
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout), self._session.get(
+                self._url, headers=headers
+            ) as response:
+                if response.status == 304:
+                    metrics.latency.record((time.perf_counter() - start) * 1000)
+                    metrics.not_modified += 1
+                    _LOGGER.debug("Data from Toon not modified")
+                    return None
+                response.raise_for_status()
+                size = await self._async_read_body(response)
+        except aiohttp.ClientError as err:
+            metrics.client_errors += 1
+            raise UpdateFailed(
+                f"Cannot connect to Toon using url '{self._url}'"
+            ) from err
+        except asyncio.TimeoutError as err:
+            metrics.timeouts += 1
+            raise UpdateFailed(
+                f"Timeout error occurred while connecting to Toon using url '{self._url}'"
+            ) from err
+        metrics.latency.record((time.perf_counter() - start) * 1000)
+        metrics.bytes_received += size
+
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        body = memoryview(self._buffer)[:size]
+        try:
+            if self._etag is None and self._last_modified is None:
+                # No validators from the Toon, fall back to the BoilerStatus app's
+                # own sample timestamp so an unchanged file is not decoded again.
+                match = SAMPLE_TIME_RE.search(body)
+                sample_time = match.group(1) if match else None
+                if sample_time is not None and sample_time == self._sample_time:
+                    _LOGGER.debug("Data from Toon unchanged since %s", sample_time)
+                    return None
+                self._sample_time = sample_time
+
+            try:
+                data = json_loads(body)
+            except ValueError as err:
+                metrics.parse_errors += 1
+                self.reset_validators()
+                raise UpdateFailed(
+                    f"Cannot parse data received from Toon: {err}"
+                ) from err
+        finally:
+            # Release the view so the buffer can grow on a later fetch.
+            body.release()
+
+        _LOGGER.debug("Data received from Toon: %s", data)
+        return data
+
+    def reset_validators(self):
+        """Forget the validators so the next fetch decodes the payload again."""
+
+        self._etag = self._last_modified = self._sample_time = None
+
+    async def _async_read_body(self, response):
+        """Read the body into the reusable buffer and return its size.
+
+        The body is capped at MAX_PAYLOAD_BYTES so a misbehaving Toon cannot
+        push an unbounded amount of data into memory.
+        """
+
+        length = response.content_length
+        if length is not None and length > MAX_PAYLOAD_BYTES:
+            self.metrics.parse_errors += 1
+            raise UpdateFailed(
+                f"Data received from Toon is too large: {length} bytes"
+            )
+
+        buffer = self._buffer
+        size = 0
+        async for chunk in response.content.iter_any():
+            end = size + len(chunk)
+            if end > MAX_PAYLOAD_BYTES:
+                self.metrics.parse_errors += 1
+                raise UpdateFailed(
+                    f"Data received from Toon exceeds {MAX_PAYLOAD_BYTES} bytes"
+                )
+            if end > len(buffer):
+                grow_to = min(max(end, 2 * len(buffer)), MAX_PAYLOAD_BYTES)
+                buffer.extend(bytes(grow_to - len(buffer)))
+            buffer[size:end] = chunk
+            size = end
+        return size
+
+
+class StaleDataError(UpdateFailed):
+    """Error to indicate the BoilerStatus app stopped writing new samples."""
+
+
+class ToonBoilerStatusCoordinator(DataUpdateCoordinator):
+    """Fetch boiler values once per interval and fan them out to all sensors.
+
+    Scheduling is left to the fleet, so update_interval is not set here.
+    With adaptive_bounds set to a (min, max) pair, poll_interval drops to min
+    while the boiler is active and doubles up to max while values are flat.
+    Derived values are added to every new snapshot, which is also appended
+    to history, rolling statistics and the on-disk store when they are given.
+    A pressure drop detector, if given, fires an event when the boiler
+    pressure keeps falling.
+    Fetches go through a circuit breaker that stops polling an unreachable
+    Toon and probes it with exponential backoff instead. Payloads pushed by
+    the Toon are passed to async_push and take the same path as fetched ones.
+    With stale_after set, a sample older than that makes the update fail and
+    polling back off up to max_interval until fresh samples arrive again.
+    sample_time is the sample time of the last payload, also when it was
+    stale and kept out of the snapshots.
+    """
+
+    def __init__(
+        self,
+        hass,
+        toon,
+        decoder,
+        name,
+        poll_interval,
+        adaptive_bounds=None,
+        history=None,
+        statistics=None,
+        pressure_drop=None,
+        store=None,
+        stale_after=None,
+        max_interval=DEFAULT_MAX_SCAN_INTERVAL,
+    ):
+        """Initialize the coordinator."""
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            always_update=False,
+        )
+        self.poll_interval = poll_interval
+        self._adaptive_bounds = adaptive_bounds
+        self.history = history
+        self.derived = DerivedValues()
+        self.statistics = statistics
+        self.pressure_drop = pressure_drop
+        self.store = store
+        self.breaker = CircuitBreaker(
+            name, BREAKER_THRESHOLD, BREAKER_BASE_BACKOFF, BREAKER_MAX_BACKOFF
+        )
+        if adaptive_bounds is not None:
+            self.poll_interval = adaptive_bounds[0]
+        self._fresh_interval = self.poll_interval
+        self._max_interval = max(max_interval, self.poll_interval)
+        self.stale_after = stale_after
+        self.stale = False
+        self.sample_time = None
+        self.toon = toon
+        self.decoder = decoder
+        self._shutdown_jobs = []
+        self._metrics_listeners = []
+
+    @callback
+    def async_on_shutdown(self, job):
+        """Register a callback or coroutine function to run on shutdown."""
+
+        self._shutdown_jobs.append(job)
+
+    @callback
+    def async_add_metrics_listener(self, update_callback):
+        """Call update_callback after every fetch or push and return a remover.
+
+        Unlike the coordinator listeners these are also called when the data
+        did not change or a failure follows another one, so the fetch metrics
+        keep moving.
+        """
+
+        self._metrics_listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._metrics_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_metrics_listeners(self):
+        """Tell the metrics listeners that the fetch metrics changed."""
+
+        for update_callback in list(self._metrics_listeners):
+            update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Stop polling, flush the store, close the session and free buffers."""
+
+        await super().async_shutdown()
+        while self._shutdown_jobs:
+            result = self._shutdown_jobs.pop()()
+            if asyncio.iscoroutine(result):
+                await result
+        if self.store is not None:
+            await self.store.async_flush(self.hass)
+        self.history = self.statistics = self.pressure_drop = self.store = None
+        if self.hass.data.get(DOMAIN, {}).get("coordinators", {}).get(
+            self.toon.key
+        ) is self:
+            del self.hass.data[DOMAIN]["coordinators"][self.toon.key]
+
+    async def _async_update_data(self):
+        """Fetch the latest boiler values from Toon."""
+
+        try:
+            return await self._async_fetch_data()
+        finally:
+            self.async_update_metrics_listeners()
+
+    async def _async_fetch_data(self):
+        """Fetch a payload through the circuit breaker and process it."""
+
+        now = self.hass.loop.time()
+        if not self.breaker.allow(now):
+            raise UpdateFailed(f"{self.name} is unreachable, waiting before retrying")
+        probing = self.breaker.state == STATE_HALF_OPEN
+        try:
+            payload = await self.toon.async_fetch(
+                PROBE_TIMEOUT if probing else FETCH_TIMEOUT
+            )
+        except UpdateFailed:
+            self.breaker.record_failure(self.hass.loop.time())
+            raise
+        self.breaker.record_success()
+        if payload is None:
+            # Unchanged since the last fetch; returning the same snapshot
+            # keeps the coordinator from notifying the sensors.
+            if error := self._stale_error(self.sample_time):
+                raise error
+            self._adapt_poll_interval(self.data)
+            return self.data
+        return self._process(payload)
+
+    @callback
+    def async_push(self, payload):
+        """Fan out a payload pushed by the Toon as if it had been polled."""
+
+        self.toon.metrics.pushes += 1
+        try:
+            snapshot = self._process(payload)
+        except StaleDataError as err:
+            self.async_set_update_error(err)
+            return
+        self.async_set_updated_data(snapshot)
+
+    @callback
+    def async_track_stale(self):
+        """Check the age of the last pushed sample and return a remover.
+
+        Without polling nothing else notices when the Toon stops pushing.
+        """
+
+        @callback
+        def _async_check(_now):
+            if self.last_update_success and (
+                error := self._stale_error(self.sample_time)
+            ):
+                self.async_set_update_error(error)
+
+        return async_track_time_interval(
+            self.hass, _async_check, STALE_CHECK_INTERVAL
+        )
+
+    def _process(self, payload):
+        """Decode a payload into a snapshot and feed it to the analytics."""
+
+        timestamp = time.time()
+        try:
+            snapshot = self.decoder.decode(
+                payload, self.derived, timestamp, self._check_sample_time
+            )
+        except TypeError as err:
+            self.toon.metrics.parse_errors += 1
+            # A bad payload must not be mistaken for an unchanged one later.
+            self.toon.reset_validators()
+            raise UpdateFailed(f"Cannot parse data received from Toon: {err}") from err
+        self._adapt_poll_interval(snapshot)
+        if self.history is not None:
+            self.history.append(timestamp, snapshot)
+        if self.statistics is not None:
+            self.statistics.update(timestamp, snapshot)
+        if self.store is not None:
+            self.store.add(timestamp, snapshot)
+        if self.pressure_drop is not None:
+            self._check_pressure_drop(timestamp, snapshot)
+        return snapshot
+
+    def _check_pressure_drop(self, timestamp, snapshot):
+        """Fire an event when the pressure trend crosses the threshold."""
+
+        if (pressure := snapshot.get("boilerpressure")) is None:
+            return
+        if self.pressure_drop.update(timestamp, pressure):
+            slope = round(self.pressure_drop.slope, 3)
+            _LOGGER.warning(
+                "Pressure of %s is dropping %.3f bar per day", self.name, -slope
+            )
+            self.hass.bus.async_fire(
+                EVENT_PRESSURE_DROP,
+                {
+                    "host": self.toon.host,
+                    "name": self.name,
+                    "pressure": pressure,
+                    "slope": slope,
+                },
+            )
+
+    def _check_sample_time(self, sample_time):
+        """Remember the sample time of a payload and reject it if it is stale."""
+
+        self.sample_time = sample_time
+        if error := self._stale_error(sample_time):
+            raise error
+
+    def _stale_error(self, sample_time):
+        """Return an error if sample_time is too old, backing off while it is."""
+
+        if self.stale_after is None or sample_time is None:
+            return None
+        age = dt_util.utcnow() - sample_time
+        if age <= self.stale_after:
+            if self.stale:
+                self.stale = False
+                self.poll_interval = self._fresh_interval
+            return None
+        self.stale = True
+        self.poll_interval = min(self.poll_interval * 2, self._max_interval)
+        return StaleDataError(
+            f"Data from {self.name} is stale, last sample taken "
+            f"{int(age.total_seconds())}s ago"
+        )
+
+    def _adapt_poll_interval(self, snapshot):
+        """Poll fast while the boiler is active and back off while it is idle."""
+
+        if self._adaptive_bounds is None:
+            return
+        min_interval, max_interval = self._adaptive_bounds
+        previous = self.data
+        if previous is None or any(
+            previous.get(key) != snapshot.get(key) for key in ACTIVITY_KEYS
+        ):
+            interval = min_interval
+        else:
+            interval = min(self.poll_interval * 2, max_interval)
+        if interval != self.poll_interval:
+            _LOGGER.debug("Polling %s every %s", self.name, interval)
+            self.poll_interval = interval
@@ -0,0 +1,236 @@
+"""Decode boilervalues.txt payloads into snapshots for the Toon boilerstatus component."""
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+
+from .snapshot import BoilerSnapshot
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+
+    def json_loads(data):
+        """Decode JSON from a bytes-like object with the stdlib decoder."""
+
+        return json.loads(bytes(data))
+
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_SAMPLE_TIME = "sampleTime"
+
+# Formats the BoilerStatus app has been seen to write sampleTime in, most
+# common first; ISO 8601 is tried last.
+SAMPLE_TIME_FORMATS = ("%d-%m-%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S")
+
+
+def _is_numeric(value):
+    """Return True if value is a number or a string holding one."""
+
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+class SampleTimeParser:
+    """Parse sampleTime strings into aware datetimes in the Toon's time zone.
+
+    The format that matched is tried first from then on, and the last string
+    is remembered so an unchanged sample time is not parsed again.
+    """
+
+    __slots__ = ("_time_zone", "_format", "_last_text", "_last_value")
+
+    def __init__(self, time_zone=timezone.utc):
+        """Initialize the parser."""
+
+        self._time_zone = time_zone
+        self._format = None
+        self._last_text = None
+        self._last_value = None
+
+    def parse(self, text):
+        """Return text as an aware datetime, or None if it cannot be parsed."""
+
+        if text == self._last_text:
+            return self._last_value
+        value = None
+        if isinstance(text, str):
+            value = self._parse(text)
+            if value is None:
+                _LOGGER.debug("Ignoring invalid sample time: %r", text)
+        self._last_text = text
+        self._last_value = value
+        return value
+
+    def _parse(self, text):
+        """Parse text with the cached format, falling back to all known ones."""
+
+        if self._format is not None:
+            try:
+                return datetime.strptime(text, self._format).replace(
+                    tzinfo=self._time_zone
+                )
+            except ValueError:
+                pass
+        for sample_time_format in SAMPLE_TIME_FORMATS:
+            try:
+                value = datetime.strptime(text, sample_time_format)
+            except ValueError:
+                continue
+            self._format = sample_time_format
+            return value.replace(tzinfo=self._time_zone)
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=self._time_zone)
+        return value
+
+
+class PayloadSchema:
+    """Field names and value types of the payloads of one Toon.
+
+    extra holds the (field, key) pairs of the numeric fields no sensor type
+    reads, keyed by the lower cased field name like the built-in types.
+    """
+
+    __slots__ = ("fields", "types", "extra")
+
+    def __init__(self, payload, known):
+        """Infer the schema from a payload."""
+
+        fields = []
+        types = {}
+        extra = []
+        for field, value in payload.items():
+            field = sys.intern(field)
+            fields.append(field)
+            types[field] = type(value).__name__
+            key = field.lower()
+            if (
+                field != ATTR_SAMPLE_TIME
+                and field not in known
+                and key not in known
+                and _is_numeric(value)
+            ):
+                extra.append((field, sys.intern(key)))
+        self.fields = tuple(fields)
+        self.types = types
+        self.extra = tuple(extra)
+
+    def as_dict(self):
+        """Return the schema for diagnostics."""
+
+        return {
+            "fields": list(self.fields),
+            "types": self.types,
+            "extra": [key for _, key in self.extra],
+        }
+
+
+class BoilerStatusDecoder:
+    """Turn a Toon payload into a snapshot keyed by sensor type in a single pass.
+
+    The schema of the payload is inferred once and only again when the number
+    of fields changes or an extra field goes missing. With extra_fields set,
+    the numeric fields no sensor type reads are added to the snapshot too.
+    Values are collected in a reused list ordered like layout and frozen into
+    a BoilerSnapshot at the end. sampleTime is parsed in time_zone.
+    """
+
+    def __init__(self, descriptions, extra_fields=False, time_zone=timezone.utc):
+        """Precompute the layout and the field -> (index, converter) table."""
+
+        self._base_layout = {
+            sys.intern(description.key): index
+            for index, description in enumerate(descriptions)
+        }
+        self._table = tuple(
+            (description.field, index, description.converter)
+            for index, description in enumerate(descriptions)
+            if description.field
+        )
+        self._known = frozenset(self._base_layout) | {
+            field for field, _, _ in self._table
+        }
+        self._extra_fields = extra_fields
+        self._extra = ()
+        self._sample_time = SampleTimeParser(time_zone)
+        self._set_layout(self._base_layout)
+        self.schema = None
+
+    def _set_layout(self, layout):
+        """Use layout for the snapshots from now on."""
+
+        self.layout = layout
+        self._empty = (None,) * len(layout)
+        self._values = list(self._empty)
+
+    def _infer_schema(self, payload):
+        """Infer the schema of payload and append its extra fields to the layout."""
+
+        schema = self.schema = PayloadSchema(payload, self._known)
+        _LOGGER.debug("Payload schema: %s", schema.types)
+        if self._extra_fields:
+            layout = dict(self._base_layout)
+            extra = []
+            for field, key in schema.extra:
+                layout[key] = len(layout)
+                extra.append((field, layout[key]))
+            self._extra = tuple(extra)
+            self._set_layout(layout)
+        return schema
+
+    def decode(self, payload, derived=None, timestamp=None, check=None):
+        """Convert all known fields of payload, skipping missing or bad values.
+
+        check, if given, is called with the parsed sample time and may raise
+        to reject the payload before derived, if given, fills in the derived
+        values and the snapshot is frozen.
+        """
+
+        if not isinstance(payload, dict):
+            raise TypeError(f"expected a JSON object, got {type(payload).__name__}")
+
+        schema = self.schema
+        if schema is None or len(payload) != len(schema.fields):
+            self._infer_schema(payload)
+
+        get = payload.get
+        values = self._values
+        values[:] = self._empty
+        for field, index, converter in self._table:
+            value = get(field)
+            if value is None:
+                continue
+            try:
+                values[index] = converter(value)
+            except (TypeError, ValueError):
+                _LOGGER.debug("Ignoring invalid value for %s: %r", field, value)
+        for field, index in self._extra:
+            value = get(field)
+            if value is None:
+                # A field was renamed; infer the schema on the next decode.
+                self.schema = None
+                continue
+            try:
+                values[index] = float(value)
+            except (TypeError, ValueError):
+                _LOGGER.debug("Ignoring invalid value for %s: %r", field, value)
+        sample_time = self._sample_time.parse(get(ATTR_SAMPLE_TIME))
+        if check is not None:
+            check(sample_time)
+        if derived is not None:
+            derived.update(timestamp, values, self.layout)
+        return BoilerSnapshot(self.layout, tuple(values), sample_time)
@@ -0,0 +1,50 @@
+"""Values derived from boiler snapshots for the Toon boilerstatus component."""
+import math
+
+# Time constant of the exponentially weighted burner duty cycle in seconds.
+DUTY_CYCLE_TIME_CONSTANT = 3600
+
+
+class DerivedValues:
+    """Add delta-T, setpoint error and burner duty cycle to each snapshot.
+
+    Every update is O(1): the duty cycle is an exponentially weighted moving
+    average of the burner state whose weight follows the time between samples,
+    so irregular (adaptive) polling does not skew it.
+    """
+
+    def __init__(self, time_constant=DUTY_CYCLE_TIME_CONSTANT):
+        """Initialize the running state."""
+
+        self._time_constant = time_constant
+        self._last_timestamp = None
+        self._duty_cycle = None
+
+    def update(self, timestamp, values, layout):
+        """Fill in the derived values of a snapshot being decoded.
+
+        values holds the snapshot values in the order of layout, which maps
+        every sensor type to its index.
+        """
+
+        out_temp = values[layout["boilerouttemp"]]
+        in_temp = values[layout["boilerintemp"]]
+        if out_temp is not None and in_temp is not None:
+            values[layout["boilerdeltatemp"]] = round(out_temp - in_temp, 2)
+
+        setpoint = values[layout["roomtempsetpoint"]]
+        room_temp = values[layout["roomtemp"]]
+        if setpoint is not None and room_temp is not None:
+            values[layout["roomtemperror"]] = round(setpoint - room_temp, 2)
+
+        modulation = values[layout["boilermodulationlevel"]]
+        if modulation is not None:
+            burner_on = 100.0 if modulation > 0 else 0.0
+            if self._duty_cycle is None:
+                self._duty_cycle = burner_on
+            else:
+                elapsed = max(0.0, timestamp - self._last_timestamp)
+                alpha = 1 - math.exp(-elapsed / self._time_constant)
+                self._duty_cycle += alpha * (burner_on - self._duty_cycle)
+            self._last_timestamp = timestamp
+            values[layout["burnerdutycycle"]] = round(self._duty_cycle, 1)
@@ -0,0 +1,37 @@
+"""Diagnostics support for the Toon boilerstatus component."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST, CONF_WEBHOOK_ID
+
+from .const import DOMAIN
+from .fleet import async_get_fleet
+
+TO_REDACT = {CONF_HOST, CONF_WEBHOOK_ID, "unique_id", "title"}
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics of a config entry."""
+
+    coordinator = hass.data[DOMAIN]["entries"][entry.entry_id]
+    toon = coordinator.toon
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "poll": {
+            "interval": coordinator.poll_interval.total_seconds(),
+            "lag": async_get_fleet(hass).lag.get(toon.key),
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+        },
+        "breaker": coordinator.breaker.as_dict(),
+        "fetch": toon.metrics.as_dict(),
+        "connections": (
+            toon.connection_stats.as_dict() if toon.connection_stats else None
+        ),
+        "schema": (
+            coordinator.decoder.schema.as_dict()
+            if coordinator.decoder.schema
+            else None
+        ),
+        "data": (
+            coordinator.data.as_dict() if coordinator.data is not None else None
+        ),
+    }
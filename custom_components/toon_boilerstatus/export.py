@@ -0,0 +1,115 @@
+"""History export for the Toon boilerstatus component."""
+import csv
+import math
+from datetime import datetime, timezone
+
+# Records read from the store and written to the file at a time.
+CHUNK_SIZE = 10000
+
+
+def export_history(stores, path, export_format, start, end, resolution):
+    """Stream the records of stores, keyed by host, to path.
+
+    Returns the number of rows written. Parquet and Arrow need pyarrow to be
+    installed. Must run in the executor.
+    """
+
+    if export_format == "csv":
+        return _export_csv(stores, path, start, end, resolution)
+    return _export_arrow(stores, path, export_format, start, end, resolution)
+
+
+def _export_csv(stores, path, start, end, resolution):
+    keys = _keys(stores)
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["host", "timestamp", "sampleTime", *keys])
+        for host, store in stores.items():
+            for records in store.iter_records(start, end, resolution, CHUNK_SIZE):
+                writer.writerows(
+                    [
+                        host,
+                        _isoformat(timestamp),
+                        "" if math.isnan(sample_time) else _isoformat(sample_time),
+                        *map(_csv_value, values),
+                    ]
+                    for timestamp, sample_time, values in records
+                )
+                rows += len(records)
+    return rows
+
+
+def _export_arrow(stores, path, export_format, start, end, resolution):
+    try:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        import pyarrow.ipc  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as err:
+        raise ValueError(
+            f"Exporting to {export_format} requires pyarrow to be installed"
+        ) from err
+
+    keys = _keys(stores)
+    schema = pa.schema(
+        [
+            ("host", pa.string()),
+            ("timestamp", pa.timestamp("s", tz="UTC")),
+            ("sampleTime", pa.timestamp("s", tz="UTC")),
+            *((key, pa.float32()) for key in keys),
+        ]
+    )
+    if export_format == "parquet":
+        writer = pa.parquet.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    rows = 0
+    with writer:
+        for host, store in stores.items():
+            for records in store.iter_records(start, end, resolution, CHUNK_SIZE):
+                columns = [
+                    pa.array([host] * len(records), pa.string()),
+                    pa.array(
+                        [int(timestamp) for timestamp, _, _ in records],
+                        schema.field("timestamp").type,
+                    ),
+                    pa.array(
+                        [
+                            None if math.isnan(sample_time) else int(sample_time)
+                            for _, sample_time, _ in records
+                        ],
+                        schema.field("sampleTime").type,
+                    ),
+                ]
+                for index in range(len(keys)):
+                    columns.append(
+                        pa.array(
+                            [values[index] for _, _, values in records],
+                            pa.float32(),
+                            from_pandas=True,
+                        )
+                    )
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                rows += len(records)
+    return rows
+
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _csv_value(value):
+    return "" if math.isnan(value) else round(value, 3)
+
+
+def _keys(stores):
+    """Return the fields shared by all stores."""
+
+    keys = None
+    for store in stores.values():
+        if keys is None:
+            keys = store.keys
+        elif store.keys != keys:
+            raise ValueError("Toons with different fields cannot be exported together")
+    return keys or ()
@@ -0,0 +1,163 @@
+"""Fleet-wide poll scheduling for the Toon boilerstatus component."""
+import asyncio
+import logging
+import math
+import random
+from functools import partial
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+
+from .const import DOMAIN, MAX_CONCURRENT_FETCHES, POLL_JITTER, STARTUP_POLL_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+# Successive multiples of the golden ratio spread any number of hosts evenly
+# over the interval without knowing the final fleet size up front.
+_GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
+
+@callback
+def async_get_fleet(hass):
+    """Return the fleet scheduler shared by all Toons, creating it if needed."""
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "fleet" not in domain_data:
+        domain_data["fleet"] = ToonFleet(hass)
+    return domain_data["fleet"]
+
+
+class _ScheduledHost:
+    """Schedule state of a single Toon."""
+
+    __slots__ = ("coordinator", "due", "slot", "lag", "timer", "task")
+
+    def __init__(self, coordinator):
+        """Initialize the schedule state."""
+
+        self.coordinator = coordinator
+        self.due = 0.0
+        self.slot = None
+        self.lag = None
+        self.timer = None
+        self.task = None
+
+
+class ToonFleet:
+    """Own the poll schedule of every configured Toon."""
+
+    def __init__(self, hass, max_concurrent=MAX_CONCURRENT_FETCHES):
+        """Initialize the fleet scheduler."""
+
+        self._hass = hass
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._hosts = {}
+        self._slots = 0
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    @callback
+    def async_add(self, coordinator):
+        """Start polling a coordinator in its own slot and return a remover.
+
+        The first poll runs soon, spread over STARTUP_POLL_WINDOW, so setup
+        never waits for the Toon; later polls move to the host's slot.
+        """
+
+        interval = coordinator.poll_interval.total_seconds()
+        phase = (self._slots * _GOLDEN_RATIO) % 1.0
+        self._slots += 1
+        delay = interval * phase + random.uniform(0, interval * POLL_JITTER)
+
+        host = _ScheduledHost(coordinator)
+        self._hosts[coordinator] = host
+        now = self._hass.loop.time()
+        first = now + phase * min(interval, STARTUP_POLL_WINDOW)
+        # Move the slot to at least one interval after the first poll, which
+        # may fall within the jitter of the slot itself.
+        slot = now + delay
+        if slot < first + interval:
+            slot += math.ceil((first + interval - slot) / interval) * interval
+        host.slot = slot
+        _LOGGER.debug("Scheduling %s with offset %.2fs", coordinator.name, delay)
+        self._schedule(host, first)
+        return partial(self._async_remove, coordinator)
+
+    @callback
+    def _async_remove(self, coordinator):
+        """Stop polling a coordinator."""
+
+        if (host := self._hosts.pop(coordinator, None)) is not None:
+            self._cancel(host)
+
+    @property
+    def lag(self):
+        """Return the last measured poll lag in seconds per Toon key."""
+
+        return {
+            host.coordinator.toon.key: host.lag for host in self._hosts.values()
+        }
+
+    @callback
+    def _schedule(self, host, due):
+        """Arm the timer for the next poll of host."""
+
+        host.due = due
+        host.timer = self._hass.loop.call_at(due, self._fire, host)
+
+    @callback
+    def _fire(self, host):
+        """Start a poll of host in the background."""
+
+        host.timer = None
+        host.task = self._hass.async_create_background_task(
+            self._async_poll(host), f"{DOMAIN} poll {host.coordinator.name}"
+        )
+
+    async def _async_poll(self, host):
+        """Refresh host once a fetch slot is free and schedule the next poll."""
+
+        coordinator = host.coordinator
+        interval = coordinator.poll_interval.total_seconds()
+        try:
+            async with self._semaphore:
+                host.lag = self._hass.loop.time() - host.due
+                if host.lag > interval:
+                    _LOGGER.warning(
+                        "Polling %s is lagging %.1fs behind schedule",
+                        coordinator.name,
+                        host.lag,
+                    )
+                await coordinator.async_refresh()
+        finally:
+            host.task = None
+            if self._hosts.get(coordinator) is host:
+                # Keep the host in its phase slot; skip ticks that were missed.
+                # The interval is read again as the refresh may have adapted it.
+                interval = coordinator.poll_interval.total_seconds()
+                now = self._hass.loop.time()
+                due = host.due + interval
+                if host.slot is not None:
+                    due, host.slot = host.slot, None
+                if (retry_in := coordinator.breaker.retry_in(now)) is not None:
+                    due = now + max(retry_in, interval)
+                elif due <= now:
+                    due += max(1, math.ceil((now - due) / interval)) * interval
+                self._schedule(host, due)
+
+    @staticmethod
+    def _cancel(host):
+        """Cancel any pending timer or running poll of host."""
+
+        if host.timer is not None:
+            host.timer.cancel()
+            host.timer = None
+        if host.task is not None:
+            host.task.cancel()
+            host.task = None
+
+    async def _async_stop(self, _event):
+        """Cancel all polls when Home Assistant stops."""
+
+        for host in self._hosts.values():
+            self._cancel(host)
+        self._hosts.clear()
@@ -0,0 +1,70 @@
+"""In-memory sample history for the Toon boilerstatus component."""
+import math
+from array import array
+
+
+class SampleHistory:
+    """Fixed-size ring buffer of snapshots, one float32 column per field.
+
+    The columns are preallocated arrays, so appending never allocates and
+    views() hands out memoryviews over the buffers without copying. A view can
+    be wrapped with numpy.frombuffer(view, dtype=numpy.float32) when NumPy is
+    available. Missing values are stored as NaN.
+    """
+
+    def __init__(self, keys, capacity):
+        """Initialize the buffer for the given snapshot keys."""
+
+        self.keys = tuple(keys)
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._columns = {key: array("f", bytes(4 * capacity)) for key in self.keys}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        """Return the number of samples held."""
+
+        return self._count
+
+    def append(self, timestamp, snapshot):
+        """Store a snapshot, overwriting the oldest sample when full."""
+
+        index = self._next
+        self._timestamps[index] = timestamp
+        for key, column in self._columns.items():
+            value = snapshot.get(key)
+            column[index] = math.nan if value is None else value
+        self._next = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def views(self, key=None):
+        """Return the samples of key, oldest first, as two memoryviews.
+
+        The first view holds the older and the second the newer part of the
+        ring; the second one is empty until the buffer has wrapped. With key
+        None the timestamp column is returned. The views are only valid until
+        the next append overwrites them.
+        """
+
+        column = self._timestamps if key is None else self._columns[key]
+        view = memoryview(column)
+        if self._count < self.capacity:
+            return view[: self._count], view[:0]
+        return view[self._next :], view[: self._next]
+
+    def as_dict(self, limit=None):
+        """Return a copy of the newest limit samples as plain lists."""
+
+        count = self._count if limit is None else min(limit, self._count)
+
+        def _tail(key):
+            older, newer = self.views(key)
+            values = older.tolist() + newer.tolist()
+            return values[len(values) - count :]
+
+        result = {"timestamp": _tail(None)}
+        for key in self.keys:
+            result[key] = [None if math.isnan(value) else value for value in _tail(key)]
+        return result
@@ -0,0 +1,79 @@
+"""Boiler pressure drop detection for the Toon boilerstatus component."""
+from collections import deque
+
+# Fraction of the window that has to be covered by samples before a slope is
+# trusted, and the minimum number of samples.
+MIN_COVERAGE = 0.5
+MIN_SAMPLES = 10
+
+SECONDS_PER_DAY = 86400
+
+
+class PressureDropDetector:
+    """Fit a rolling least-squares line through the pressure of a window.
+
+    The regression sums are updated incrementally when samples enter and
+    leave the window, so each sample costs O(1) whatever the window length.
+    Times are taken relative to an origin that is moved to the oldest sample
+    once per window to keep the sums numerically stable.
+    """
+
+    def __init__(self, window, threshold):
+        """Initialize for a window in seconds and a threshold in bar per day."""
+
+        self._window = window
+        self._threshold = threshold
+        self._samples = deque()
+        self._origin = None
+        self._since_rebase = 0
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+        self.slope = None
+        self.triggered = False
+
+    def _add_sums(self, timestamp, value, sign):
+        t = timestamp - self._origin
+        self._sum_t += sign * t
+        self._sum_y += sign * value
+        self._sum_tt += sign * t * t
+        self._sum_ty += sign * t * value
+
+    def _rebase(self):
+        self._origin = self._samples[0][0]
+        self._since_rebase = 0
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+        for timestamp, value in self._samples:
+            self._add_sums(timestamp, value, 1)
+
+    def update(self, timestamp, pressure):
+        """Add a sample and return True when a new pressure drop is detected."""
+
+        samples = self._samples
+        samples.append((timestamp, pressure))
+        if self._origin is None:
+            self._origin = timestamp
+        self._add_sums(timestamp, pressure, 1)
+        cutoff = timestamp - self._window
+        while samples[0][0] < cutoff:
+            self._add_sums(*samples.popleft(), -1)
+        self._since_rebase += 1
+        if self._since_rebase >= len(samples):
+            self._rebase()
+
+        count = len(samples)
+        span = timestamp - samples[0][0]
+        if count < MIN_SAMPLES or span < self._window * MIN_COVERAGE:
+            self.slope = None
+            return False
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return False
+        slope = (count * self._sum_ty - self._sum_t * self._sum_y) / denominator
+        self.slope = slope * SECONDS_PER_DAY
+
+        if not self.triggered and self.slope <= -self._threshold:
+            self.triggered = True
+            return True
+        # Re-arm only once the drop has clearly stopped.
+        if self.triggered and self.slope > -self._threshold / 2:
+            self.triggered = False
+        return False
@@ -0,0 +1,106 @@
+"""Fetch instrumentation for the Toon boilerstatus component."""
+import math
+from array import array
+
+# Bucket boundaries grow by 5%, so every percentile is within 5% of the truth.
+_LOWEST_MS = 0.1
+_HIGHEST_MS = 60000.0
+_GROWTH = 1.05
+_LOG_GROWTH = math.log(_GROWTH)
+_BUCKETS = int(math.log(_HIGHEST_MS / _LOWEST_MS) / _LOG_GROWTH) + 2
+
+
+class LatencyHistogram:
+    """Fixed-size, log-bucketed latency histogram in the spirit of HdrHistogram.
+
+    Recording is a single logarithm and a counter increment, and the memory
+    use does not depend on the number of recorded values.
+    """
+
+    __slots__ = ("_counts", "count", "max")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+
+        self._counts = array("L", bytes(array("L").itemsize * _BUCKETS))
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, value_ms):
+        """Record a latency in milliseconds."""
+
+        if value_ms <= _LOWEST_MS:
+            index = 0
+        else:
+            index = min(
+                int(math.log(value_ms / _LOWEST_MS) / _LOG_GROWTH) + 1, _BUCKETS - 1
+            )
+        self._counts[index] += 1
+        self.count += 1
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, percent):
+        """Return the upper bound of the bucket holding the given percentile."""
+
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_LOWEST_MS * _GROWTH**index, self.max)
+        return self.max
+
+
+class FetchMetrics:
+    """Latency histogram and counters of the fetches from a single Toon."""
+
+    __slots__ = (
+        "latency",
+        "fetches",
+        "not_modified",
+        "client_errors",
+        "timeouts",
+        "parse_errors",
+        "bytes_received",
+        "pushes",
+    )
+
+    def __init__(self):
+        """Initialize the counters."""
+
+        self.latency = LatencyHistogram()
+        self.fetches = 0
+        self.not_modified = 0
+        self.client_errors = 0
+        self.timeouts = 0
+        self.parse_errors = 0
+        self.bytes_received = 0
+        self.pushes = 0
+
+    @property
+    def errors(self):
+        """Return the total number of failed fetches."""
+
+        return self.client_errors + self.timeouts + self.parse_errors
+
+    def as_dict(self):
+        """Return all counters and latency percentiles."""
+
+        return {
+            "fetches": self.fetches,
+            "not_modified": self.not_modified,
+            "client_errors": self.client_errors,
+            "timeouts": self.timeouts,
+            "parse_errors": self.parse_errors,
+            "bytes_received": self.bytes_received,
+            "pushes": self.pushes,
+            "latency_ms": {
+                "p50": self.latency.percentile(50),
+                "p95": self.latency.percentile(95),
+                "p99": self.latency.percentile(99),
+                "max": self.latency.max,
+            },
+        }
@@ -0,0 +1,79 @@
+"""Push ingestion for the Toon boilerstatus component."""
+import logging
+from http import HTTPStatus
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.setup import async_setup_component
+
+from .const import DOMAIN, MAX_PAYLOAD_BYTES
+from .decoder import json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_webhook(hass):
+    """Set up the webhook component, which is only needed in push mode."""
+
+    return await async_setup_component(hass, webhook.DOMAIN, {})
+
+
+@callback
+def async_register_push(hass, coordinator, webhook_id):
+    """Accept boilervalues.txt payloads for a coordinator and return a remover.
+
+    The webhook only accepts requests from the local network, where the Toon
+    or a relay next to it posts the file whenever the BoilerStatus app rewrites
+    it.
+    """
+
+    async def _async_handle(hass, webhook_id, request):
+        """Decode a pushed payload and fan it out to the sensors."""
+
+        metrics = coordinator.toon.metrics
+        try:
+            if (request.content_length or 0) > MAX_PAYLOAD_BYTES:
+                metrics.parse_errors += 1
+                return web.Response(status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            body = bytearray()
+            async for chunk in request.content.iter_any():
+                body += chunk
+                if len(body) > MAX_PAYLOAD_BYTES:
+                    metrics.parse_errors += 1
+                    return web.Response(status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            metrics.bytes_received += len(body)
+            try:
+                coordinator.async_push(json_loads(body))
+            except ValueError as err:
+                metrics.parse_errors += 1
+                _LOGGER.warning("Cannot parse data pushed to %s: %s", webhook_id, err)
+                return web.Response(status=HTTPStatus.BAD_REQUEST)
+            except UpdateFailed as err:
+                _LOGGER.warning("Rejected data pushed to %s: %s", webhook_id, err)
+                return web.Response(status=HTTPStatus.BAD_REQUEST)
+            return None
+        finally:
+            coordinator.async_update_metrics_listeners()
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        coordinator.name,
+        webhook_id,
+        _async_handle,
+        local_only=True,
+        allowed_methods=["POST", "PUT"],
+    )
+    _LOGGER.info(
+        "Waiting for %s to push its data to %s",
+        coordinator.name,
+        webhook.async_generate_path(webhook_id),
+    )
+
+    @callback
+    def async_unregister():
+        webhook.async_unregister(hass, webhook_id)
+
+    return async_unregister
@@ -0,0 +1,136 @@
+"""Rolling statistics over sliding time windows for the Toon boilerstatus component."""
+import math
+from collections import deque
+
+from .const import STATISTICS_WINDOWS
+
+# Each window is tracked in this many time buckets, which bounds the memory
+# per window and field regardless of the scan interval.
+WINDOW_BUCKETS = 120
+
+
+class SlidingWindow:
+    """Min, max, mean and standard deviation of the last window seconds.
+
+    Samples are aggregated per bucket with Welford's algorithm. The window
+    totals are kept up to date by merging new samples in and subtracting
+    expired buckets out, and min/max come from monotonic deques of bucket
+    extremes, so every sample costs amortized O(1). The window edge moves in
+    steps of one bucket (1/WINDOW_BUCKETS of the window).
+    """
+
+    __slots__ = (
+        "window",
+        "_bucket_size",
+        "_buckets",
+        "_mins",
+        "_maxs",
+        "_count",
+        "_mean",
+        "_m2",
+    )
+
+    def __init__(self, window):
+        """Initialize an empty window of the given length in seconds."""
+
+        self.window = window
+        self._bucket_size = window / WINDOW_BUCKETS
+        # Every bucket is [start, count, mean, m2].
+        self._buckets = deque()
+        self._mins = deque()
+        self._maxs = deque()
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, timestamp, value):
+        """Add a sample and expire the buckets that fell out of the window."""
+
+        start = timestamp - timestamp % self._bucket_size
+        buckets = self._buckets
+        if not buckets or buckets[-1][0] < start:
+            buckets.append([start, 0, 0.0, 0.0])
+        bucket = buckets[-1]
+
+        bucket[1] += 1
+        delta = value - bucket[2]
+        bucket[2] += delta / bucket[1]
+        bucket[3] += delta * (value - bucket[2])
+
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+        mins, maxs = self._mins, self._maxs
+        while mins and mins[-1][1] >= value:
+            mins.pop()
+        mins.append((start, value))
+        while maxs and maxs[-1][1] <= value:
+            maxs.pop()
+        maxs.append((start, value))
+
+        self._expire(timestamp - self.window)
+
+    def _expire(self, cutoff):
+        """Subtract the buckets that ended before cutoff from the totals."""
+
+        buckets = self._buckets
+        while buckets and buckets[0][0] + self._bucket_size <= cutoff:
+            start, count, mean, m2 = buckets.popleft()
+            remaining = self._count - count
+            if remaining <= 0:
+                self._count, self._mean, self._m2 = 0, 0.0, 0.0
+            else:
+                new_mean = (self._count * self._mean - count * mean) / remaining
+                delta = mean - new_mean
+                self._m2 = max(
+                    0.0, self._m2 - m2 - delta * delta * count * remaining / self._count
+                )
+                self._count, self._mean = remaining, new_mean
+            while self._mins and self._mins[0][0] <= start:
+                self._mins.popleft()
+            while self._maxs and self._maxs[0][0] <= start:
+                self._maxs.popleft()
+
+    def as_dict(self):
+        """Return the statistics of the window, or an empty dict if empty."""
+
+        if not self._count:
+            return {}
+        stddev = math.sqrt(self._m2 / (self._count - 1)) if self._count > 1 else 0.0
+        return {
+            "min": self._mins[0][1],
+            "max": self._maxs[0][1],
+            "mean": self._mean,
+            "stddev": stddev,
+        }
+
+
+class RollingStatistics:
+    """Sliding window statistics of every snapshot field."""
+
+    def __init__(self, keys, windows=STATISTICS_WINDOWS):
+        """Initialize one window per field and window length."""
+
+        self._windows = {
+            key: {label: SlidingWindow(length) for label, length in windows.items()}
+            for key in keys
+        }
+
+    def update(self, timestamp, snapshot):
+        """Add the values of a snapshot."""
+
+        for key, windows in self._windows.items():
+            if (value := snapshot.get(key)) is not None:
+                for window in windows.values():
+                    window.add(timestamp, value)
+
+    def as_attributes(self, key):
+        """Return the statistics of a field as state attributes."""
+
+        attributes = {}
+        for label, window in self._windows.get(key, {}).items():
+            for name, value in window.as_dict().items():
+                attributes[f"{name}_{label}"] = round(value, 3)
+        return attributes
@@ -17,18 +17,21 @@ sensor:
         - boilermodulationlevel
         - roomtemp
         - roomtempsetpoint
+        - boilerdeltatemp
+        - roomtemperror
+        - burnerdutycycle
 """
-import asyncio
 import logging
-from datetime import timedelta
-from typing import Final
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any, Final
 
-import aiohttp
-import async_timeout
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.components.sensor import (
     PLATFORM_SCHEMA,
+    RestoreSensor,
     SensorStateClass,
     SensorDeviceClass,
     SensorEntity,
@@ -37,98 +40,284 @@ from homeassistant.components.sensor import (
 from homeassistant.const import (
     CONF_HOST,
     CONF_NAME,
+    CONF_PLATFORM,
     CONF_PORT,
     CONF_RESOURCES,
+    CONF_WEBHOOK_ID,
     PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
     UnitOfPressure,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.util import Throttle
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    CONF_ABSOLUTE,
+    CONF_ADAPTIVE_POLLING,
+    CONF_DEADBAND,
+    CONF_EXTRA_FIELDS,
+    CONF_HEARTBEAT,
+    CONF_HISTORY_SIZE,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_MAX_CONNECTIONS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PRESSURE_DROP_THRESHOLD,
+    CONF_PRESSURE_DROP_WINDOW,
+    CONF_PUSH,
+    CONF_RELATIVE,
+    CONF_STALE_AFTER,
+    CONF_STATISTICS,
+    CONF_STORE,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_NAME,
+    DEFAULT_PORT,
+    DEFAULT_PRESSURE_DROP_WINDOW,
+    DEFAULT_STALE_AFTER,
+    DOMAIN,
+    MIN_POLL_INTERVAL,
+    MIN_TIME_BETWEEN_UPDATES,
+    STATISTICS_REFRESH_INTERVAL,
+    STATISTICS_WINDOWS,
+)
+from .coordinator import async_create_coordinator
+from .metrics import FetchMetrics
 
-BASE_URL = "http://{0}:{1}/boilerstatus/boilervalues.txt"
 _LOGGER = logging.getLogger(__name__)
 
-MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=10)
-DEFAULT_NAME = "Toon "
-
-SENSOR_LIST = {
-    "boilersetpoint",
-    "boilerintemp",
-    "boilerouttemp",
-    "boilerpressure",
-    "boilermodulationlevel",
-    "roomtemp",
-    "roomtempsetpoint",
-}
-
-SENSOR_TYPES: Final[tuple[SensorEntityDescription, ...]] = (
-    SensorEntityDescription(
+
+@dataclass(frozen=True, kw_only=True)
+class ToonBoilerStatusSensorEntityDescription(SensorEntityDescription):
+    """Describes a Toon boilerstatus sensor and the payload field it reads.
+
+    Sensors without a field show a value derived from the other fields.
+
+    A new value is only written when it differs from the last written value
+    by more than deadband_abs and by more than deadband_rel of that value.
+    """
+
+    field: str | None = None
+    converter: Callable[[Any], Any] = float
+    deadband_abs: float = 0.0
+    deadband_rel: float = 0.0
+
+
+SENSOR_TYPES: Final[tuple[ToonBoilerStatusSensorEntityDescription, ...]] = (
+    ToonBoilerStatusSensorEntityDescription(
         key="boilersetpoint",
+        field="boilerSetpoint",
         name="Boiler SetPoint",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    ToonBoilerStatusSensorEntityDescription(
         key="boilerintemp",
+        field="boilerInTemp",
         name="Boiler InTemp",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    ToonBoilerStatusSensorEntityDescription(
         key="boilerouttemp",
+        field="boilerOutTemp",
         name="Boiler OutTemp",
         icon="mdi:flash",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    ToonBoilerStatusSensorEntityDescription(
         key="boilerpressure",
+        field="boilerPressure",
         name="Boiler Pressure",
         icon="mdi:gauge",
         native_unit_of_measurement=UnitOfPressure.BAR,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband_abs=0.01,
     ),
-    SensorEntityDescription(
+    ToonBoilerStatusSensorEntityDescription(
         key="boilermodulationlevel",
+        field="boilerModulationLevel",
         name="Boiler Modulation",
         icon="mdi:fire",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    ToonBoilerStatusSensorEntityDescription(
         key="roomtemp",
+        field="roomTemp",
         name="Room Temp",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    ToonBoilerStatusSensorEntityDescription(
         key="roomtempsetpoint",
+        field="roomTempSetpoint",
         name="Room Temp SetPoint",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    ToonBoilerStatusSensorEntityDescription(
+        key="boilerdeltatemp",
+        name="Boiler DeltaTemp",
+        icon="mdi:thermometer-lines",
+        native_unit_of_measurement=UnitOfTemperature.KELVIN,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    ToonBoilerStatusSensorEntityDescription(
+        key="roomtemperror",
+        name="Room Temp SetPoint Error",
+        icon="mdi:thermometer-alert",
+        native_unit_of_measurement=UnitOfTemperature.KELVIN,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    ToonBoilerStatusSensorEntityDescription(
+        key="burnerdutycycle",
+        name="Burner Duty Cycle",
+        icon="mdi:fire-circle",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband_abs=0.5,
+    ),
+)
+
+SENSOR_LIST = {description.key for description in SENSOR_TYPES}
+
+
+@dataclass(frozen=True, kw_only=True)
+class ToonBoilerStatusDiagnosticEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor reading the fetch metrics of a Toon."""
+
+    value_fn: Callable[[FetchMetrics], Any]
+    attributes_fn: Callable[[FetchMetrics], dict[str, Any]] | None = None
+
+
+def _latency_percentile(percent):
+    """Return a value_fn reading a rounded fetch latency percentile."""
+
+    def _value(metrics):
+        value = metrics.latency.percentile(percent)
+        return None if value is None else round(value, 1)
+
+    return _value
+
+
+DIAGNOSTIC_SENSOR_TYPES: Final[
+    tuple[ToonBoilerStatusDiagnosticEntityDescription, ...]
+] = (
+    *(
+        ToonBoilerStatusDiagnosticEntityDescription(
+            key=f"fetchlatencyp{percent}",
+            name=f"Fetch Latency p{percent}",
+            icon="mdi:timer-outline",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=_latency_percentile(percent),
+        )
+        for percent in (50, 95, 99)
+    ),
+    ToonBoilerStatusDiagnosticEntityDescription(
+        key="fetcherrors",
+        name="Fetch Errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.errors,
+        attributes_fn=lambda metrics: {
+            "Client Errors": metrics.client_errors,
+            "Timeouts": metrics.timeouts,
+            "Parse Errors": metrics.parse_errors,
+        },
+    ),
+    ToonBoilerStatusDiagnosticEntityDescription(
+        key="bytesreceived",
+        name="Bytes Received",
+        icon="mdi:download-network-outline",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.bytes_received,
+    ),
+)
+
+SAMPLE_TIME_SENSOR_TYPE: Final = SensorEntityDescription(
+    key="sampletime",
+    name="Sample Time",
+    icon="mdi:clock-outline",
+    device_class=SensorDeviceClass.TIMESTAMP,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+DEADBAND_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_ABSOLUTE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_RELATIVE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
 )
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
         vol.Required(CONF_HOST): cv.string,
-        vol.Optional(CONF_PORT, default=80): cv.positive_int,
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.positive_int,
         vol.Required(CONF_RESOURCES, default=list(SENSOR_LIST)): vol.All(
             cv.ensure_list, [vol.In(SENSOR_LIST)]
         ),
+        vol.Optional(CONF_ADAPTIVE_POLLING, default=False): cv.boolean,
+        vol.Optional(CONF_PUSH, default=False): cv.boolean,
+        vol.Optional(CONF_WEBHOOK_ID): cv.string,
+        vol.Optional(CONF_EXTRA_FIELDS, default=False): cv.boolean,
+        vol.Optional(CONF_STALE_AFTER, default=DEFAULT_STALE_AFTER): cv.time_period,
+        vol.Optional(
+            CONF_MIN_SCAN_INTERVAL, default=MIN_TIME_BETWEEN_UPDATES
+        ): vol.All(cv.time_period, vol.Range(min=MIN_POLL_INTERVAL)),
+        vol.Optional(
+            CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL
+        ): vol.All(cv.time_period, vol.Range(min=MIN_POLL_INTERVAL)),
+        vol.Optional(
+            CONF_KEEPALIVE_TIMEOUT, default=DEFAULT_KEEPALIVE_TIMEOUT
+        ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(CONF_MAX_CONNECTIONS, default=DEFAULT_MAX_CONNECTIONS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=2)
+        ),
+        vol.Optional(CONF_DEADBAND, default={}): {vol.In(SENSOR_LIST): DEADBAND_SCHEMA},
+        vol.Optional(CONF_HEARTBEAT, default=DEFAULT_HEARTBEAT): cv.time_period,
+        vol.Optional(CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_STATISTICS, default=False): cv.boolean,
+        vol.Optional(CONF_STORE, default=False): cv.boolean,
+        vol.Optional(CONF_PRESSURE_DROP_THRESHOLD): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(
+            CONF_PRESSURE_DROP_WINDOW, default=DEFAULT_PRESSURE_DROP_WINDOW
+        ): cv.time_period,
     }
 )
 
@@ -136,60 +325,174 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Setup the Toon boilerstatus sensors."""
 
-    session = async_get_clientsession(hass)
-    data = ToonBoilerStatusData(session, config.get(CONF_HOST), config.get(CONF_PORT))
-    prefix = config.get(CONF_NAME)
-    await data.async_update()
+    if config[CONF_PUSH] and CONF_WEBHOOK_ID not in config:
+        # A default id would be guessable by anyone who can reach Home Assistant.
+        _LOGGER.error(
+            "%s needs a %s to push its data to", config[CONF_NAME], CONF_WEBHOOK_ID
+        )
+        return
+    coordinator = await _async_create_coordinator(hass, config)
+    if coordinator is None:
+        return
+    _async_add_sensors(config, coordinator, async_add_entities, config[CONF_NAME])
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Setup the Toon boilerstatus sensors of a config entry."""
+
+    config = PLATFORM_SCHEMA(
+        {
+            CONF_PLATFORM: DOMAIN,
+            **entry.data,
+            **entry.options,
+            # Only the random id in the entry data is used, never an option.
+            CONF_WEBHOOK_ID: entry.data[CONF_WEBHOOK_ID],
+        }
+    )
+    coordinator = await _async_create_coordinator(hass, config)
+    if coordinator is None:
+        raise ConfigEntryNotReady("Cannot set up the webhook to push data to")
+    hass.data[DOMAIN].setdefault("entries", {})[entry.entry_id] = coordinator
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, entry.unique_id)},
+        name=entry.title,
+        manufacturer="Eneco",
+        model="Toon",
+    )
+    _async_add_sensors(
+        config,
+        coordinator,
+        async_add_entities,
+        config[CONF_NAME],
+        entry.unique_id,
+        device_info,
+    )
+
+
+async def _async_create_coordinator(hass, config):
+    """Create the coordinator, or return None if push mode cannot be set up."""
+    if config[CONF_PUSH]:
+        # pylint: disable-next=import-outside-toplevel
+        from .push import async_setup_webhook
+
+        if not await async_setup_webhook(hass):
+            return None
+    return async_create_coordinator(hass, config, SENSOR_TYPES)
+
+
+@callback
+def _async_add_sensors(
+    config,
+    coordinator,
+    async_add_entities,
+    prefix,
+    unique_prefix=None,
+    device_info=None,
+):
+    """Add the configured sensors of a Toon."""
 
     entities = []
     for description in SENSOR_TYPES:
         if description.key in config[CONF_RESOURCES]:
             _LOGGER.debug("Adding Toon Boiler Status sensor: %s", description.name)
-            sensor = ToonBoilerStatusSensor(prefix, description, data)
+            if deadband := config[CONF_DEADBAND].get(description.key):
+                description = replace(
+                    description,
+                    deadband_abs=deadband.get(CONF_ABSOLUTE, description.deadband_abs),
+                    deadband_rel=deadband.get(CONF_RELATIVE, description.deadband_rel),
+                )
+            sensor = ToonBoilerStatusSensor(
+                prefix,
+                description,
+                coordinator,
+                config[CONF_HEARTBEAT],
+                unique_prefix=unique_prefix,
+                device_info=device_info,
+            )
             entities.append(sensor)
-    async_add_entities(entities, True)
-
-
-# pylint: disable=abstract-method
-class ToonBoilerStatusData:
-    """Handle Toon object and limit updates."""
-
-    def __init__(self, session, host, port):
-        """Initialize the data object."""
-
-        self._session = session
-        self._url = BASE_URL.format(host, port)
-        self.data = None
-
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    async def async_update(self):
-        """Download and update data from Toon."""
-
-        try:
-            async with async_timeout.timeout(5):
-                response = await self._session.get(
-                    self._url, headers={"Accept-Encoding": "identity"}
+    entities.extend(
+        ToonBoilerStatusDiagnosticSensor(
+            prefix,
+            description,
+            coordinator,
+            unique_prefix=unique_prefix,
+            device_info=device_info,
+        )
+        for description in DIAGNOSTIC_SENSOR_TYPES
+    )
+    entities.append(
+        ToonBoilerStatusSampleTimeSensor(
+            prefix,
+            SAMPLE_TIME_SENSOR_TYPE,
+            coordinator,
+            unique_prefix=unique_prefix,
+            device_info=device_info,
+        )
+    )
+    async_add_entities(entities)
+
+    if config[CONF_EXTRA_FIELDS]:
+        added = set()
+
+        @callback
+        def _async_add_extra_sensors():
+            """Add a sensor for every numeric field no sensor type reads."""
+            if (schema := coordinator.decoder.schema) is None:
+                return
+            extra = [(field, key) for field, key in schema.extra if key not in added]
+            if not extra:
+                return
+            added.update(key for _, key in extra)
+            async_add_entities(
+                ToonBoilerStatusSensor(
+                    prefix,
+                    ToonBoilerStatusSensorEntityDescription(
+                        key=key,
+                        field=field,
+                        name=field,
+                        icon="mdi:gauge",
+                        state_class=SensorStateClass.MEASUREMENT,
+                    ),
+                    coordinator,
+                    config[CONF_HEARTBEAT],
+                    unique_prefix=unique_prefix,
+                    device_info=device_info,
                 )
-            self.data = await response.json(content_type="text/plain")
-            _LOGGER.debug("Data received from Toon: %s", self.data)
-        except aiohttp.ClientError:
-            _LOGGER.error("Cannot connect to Toon using url '%s'", self._url)
-        except asyncio.TimeoutError:
-            _LOGGER.error(
-                "Timeout error occurred while connecting to Toon using url '%s'",
-                self._url
+                for field, key in extra
             )
-        except (TypeError, KeyError) as err:
-            _LOGGER.error(f"Cannot parse data received from Toon: %s", err)
 
+        coordinator.async_on_shutdown(
+            coordinator.async_add_listener(_async_add_extra_sensors)
+        )
 
-class ToonBoilerStatusSensor(SensorEntity):
-    """Representation of a Toon Boilerstatus sensor."""
 
-    def __init__(self, prefix, description: SensorEntityDescription, data):
+class ToonBoilerStatusSensor(CoordinatorEntity, RestoreSensor):
+    """Representation of a Toon Boilerstatus sensor.
+
+    Until the first snapshot arrives the sensor shows the value it had before
+    the restart, marked stale.
+    """
+
+    # The rolling statistics change with every sample and can be recomputed
+    # at any time, so they are kept out of the recorder.
+    _unrecorded_attributes = frozenset(
+        f"{name}_{label}"
+        for name in ("min", "max", "mean", "stddev")
+        for label in STATISTICS_WINDOWS
+    )
+
+    def __init__(
+        self,
+        prefix,
+        description: ToonBoilerStatusSensorEntityDescription,
+        coordinator,
+        heartbeat,
+        unique_prefix=None,
+        device_info=None,
+    ):
         """Initialize the sensor."""
+        super().__init__(coordinator)
         self.entity_description = description
-        self._data = data
         self._prefix = prefix
         self._type = self.entity_description.key
         self._attr_icon = self.entity_description.icon
@@ -199,15 +502,21 @@ class ToonBoilerStatusSensor(SensorEntity):
             self.entity_description.native_unit_of_measurement
         )
         self._attr_device_class = self.entity_description.device_class
-        self._attr_unique_id = f"{self._prefix}_{self._type}"
+        self._attr_unique_id = f"{unique_prefix or self._prefix}_{self._type}"
+        self._attr_device_info = device_info
 
-        self._state = None
+        self._heartbeat = heartbeat.total_seconds()
         self._last_updated = None
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
+        self._stale = False
+        if coordinator.statistics is not None:
+            # Refresh the rolling statistics attributes on a cadence of their
+            # own instead of letting them bypass the deadband on every sample.
+            self._heartbeat = min(
+                self._heartbeat, STATISTICS_REFRESH_INTERVAL.total_seconds()
+            )
+        self._written_at = None
+        self._written_available = None
+        self._update_from_data()
 
     @property
     def extra_state_attributes(self):
@@ -215,50 +524,163 @@ class ToonBoilerStatusSensor(SensorEntity):
         attr = {}
         if self._last_updated is not None:
             attr["Last Updated"] = self._last_updated
+        if self._stale:
+            attr["Stale"] = True
+        attr.update(self._statistics_attributes())
         return attr
 
-    async def async_update(self):
-        """Get the latest data and use it to update our sensor state."""
-
-        await self._data.async_update()
-        boiler = self._data.data
-
-        if boiler:
-            if "sampleTime" in boiler and boiler["sampleTime"] is not None:
-                self._last_updated = boiler["sampleTime"]
+    def _statistics_attributes(self):
+        """Return the rolling statistics of this sensor, if enabled."""
+        if self.coordinator.statistics is None:
+            return {}
+        return self.coordinator.statistics.as_attributes(self._type)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known state if no snapshot has arrived yet."""
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            return
+        if (last_sensor_data := await self.async_get_last_sensor_data()) is None:
+            return
+        self._attr_native_value = last_sensor_data.native_value
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._last_updated = last_state.attributes.get("Last Updated")
+        self._stale = True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new snapshot only if it changed more than the deadband."""
+        if (
+            not self._stale
+            and self.available == self._written_available
+            and self._written_at is not None
+            and time.monotonic() - self._written_at < self._heartbeat
+            and not self._exceeds_deadband(self._snapshot_value())
+        ):
+            return
+        self._update_from_data()
+        super()._handle_coordinator_update()
+
+    def _snapshot_value(self):
+        """Return the value of this sensor in the latest snapshot."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.get(self._type)
+
+    def _exceeds_deadband(self, value):
+        """Return True if value differs meaningfully from the written state."""
+        previous = self._attr_native_value
+        if value is None or previous is None:
+            return value != previous
+        delta = abs(value - previous)
+        return (
+            delta > self.entity_description.deadband_abs
+            and delta > self.entity_description.deadband_rel * abs(previous)
+        )
 
-            if self._type == "boilersetpoint":
-                if "boilerSetpoint" in boiler and boiler["boilerSetpoint"] is not None:
-                    self._state = float(boiler["boilerSetpoint"])
+    def _update_from_data(self):
+        """Take the state to be written from the latest snapshot."""
+        self._attr_native_value = self._snapshot_value()
+        if self.coordinator.data is not None:
+            self._last_updated = self.coordinator.data.sample_time
+            self._stale = False
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember when it was written."""
+        self._remember_written()
+        super().async_write_ha_state()
+
+    def _remember_written(self):
+        """Remember when and how the state was written."""
+        self._written_at = time.monotonic()
+        self._written_available = self.available
+
+
+class ToonBoilerStatusDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a Toon Boilerstatus fetch metrics sensor."""
+
+    entity_description: ToonBoilerStatusDiagnosticEntityDescription
+
+    def __init__(
+        self,
+        prefix,
+        description: ToonBoilerStatusDiagnosticEntityDescription,
+        coordinator,
+        unique_prefix=None,
+        device_info=None,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = prefix + description.name
+        self._attr_unique_id = f"{unique_prefix or prefix}_{description.key}"
+        self._attr_device_info = device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state after every fetch, also when the data is unchanged."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_metrics_listener(self.async_write_ha_state)
+        )
 
-            elif self._type == "boilerintemp":
-                if "boilerInTemp" in boiler and boiler["boilerInTemp"] is not None:
-                    self._state = float(boiler["boilerInTemp"])
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ignore, the metrics listener already wrote the state of this fetch."""
 
-            elif self._type == "boilerouttemp":
-                if "boilerOutTemp" in boiler and boiler["boilerOutTemp"] is not None:
-                    self._state = float(boiler["boilerOutTemp"])
+    @property
+    def available(self):
+        """Stay available while the Toon is unreachable to report the errors."""
+        return True
 
-            elif self._type == "boilerpressure":
-                if "boilerPressure" in boiler and boiler["boilerPressure"] is not None:
-                    self._state = float(boiler["boilerPressure"])
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.toon.metrics)
 
-            elif self._type == "boilermodulationlevel":
-                if (
-                    "boilerModulationLevel" in boiler
-                    and boiler["boilerModulationLevel"] is not None
-                ):
-                    self._state = float(boiler["boilerModulationLevel"])
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of this device."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator.toon.metrics)
+
+
+class ToonBoilerStatusSampleTimeSensor(CoordinatorEntity, SensorEntity):
+    """Representation of the time the BoilerStatus app took the last sample."""
+
+    def __init__(
+        self,
+        prefix,
+        description: SensorEntityDescription,
+        coordinator,
+        unique_prefix=None,
+        device_info=None,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = prefix + description.name
+        self._attr_unique_id = f"{unique_prefix or prefix}_{description.key}"
+        self._attr_device_info = device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state after every fetch, also when the data is stale."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_metrics_listener(self.async_write_ha_state)
+        )
 
-            elif self._type == "roomtemp":
-                if "roomTemp" in boiler and boiler["roomTemp"] is not None:
-                    self._state = float(boiler["roomTemp"])
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ignore, the metrics listener already wrote the state of this fetch."""
 
-            elif self._type == "roomtempsetpoint":
-                if (
-                    "roomTempSetpoint" in boiler
-                    and boiler["roomTempSetpoint"] is not None
-                ):
-                    self._state = float(boiler["roomTempSetpoint"])
+    @property
+    def available(self):
+        """Stay available while the data is stale to show how old it is."""
+        return self.coordinator.sample_time is not None
 
-            _LOGGER.debug("Device: %s State: %s", self._type, self._state)
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.coordinator.sample_time
@@ -0,0 +1,83 @@
+"""Immutable boiler value snapshots for the Toon boilerstatus component."""
+
+
+class BoilerSnapshot:
+    """Boiler values of one sample, shared read-only by all sensors.
+
+    The values are kept in a tuple ordered like layout, a key -> index dict
+    owned by the decoder and shared by all its snapshots, so a snapshot costs
+    one small object and one tuple instead of a dict with its own keys.
+    Missing values are None.
+    """
+
+    __slots__ = ("_layout", "_values", "sample_time")
+
+    def __init__(self, layout, values, sample_time):
+        """Initialize the snapshot."""
+
+        object.__setattr__(self, "_layout", layout)
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "sample_time", sample_time)
+
+    def __setattr__(self, name, value):
+        """Refuse to change the snapshot."""
+
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    __delattr__ = __setattr__
+
+    def get(self, key, default=None):
+        """Return the value of key, or default if it is missing."""
+
+        index = self._layout.get(key)
+        if index is None or (value := self._values[index]) is None:
+            return default
+        return value
+
+    def __getitem__(self, key):
+        """Return the value of key."""
+
+        if (value := self.get(key)) is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        """Return True if the snapshot has a value for key."""
+
+        return self.get(key) is not None
+
+    def __eq__(self, other):
+        """Compare the values and the sample time of two snapshots."""
+
+        if not isinstance(other, BoilerSnapshot):
+            return NotImplemented
+        return (
+            self._layout is other._layout
+            and self._values == other._values
+            and self.sample_time == other.sample_time
+        )
+
+    def __hash__(self):
+        """Hash the values and the sample time."""
+
+        return hash((self._values, self.sample_time))
+
+    def __repr__(self):
+        """Return the snapshot as a readable string."""
+
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+    def items(self):
+        """Return the (key, value) pairs of all values that are present."""
+
+        values = self._values
+        return [
+            (key, values[index])
+            for key, index in self._layout.items()
+            if values[index] is not None
+        ]
+
+    def as_dict(self):
+        """Return the snapshot as a dict, for diagnostics and services."""
+
+        return {"sampleTime": self.sample_time, **dict(self.items())}
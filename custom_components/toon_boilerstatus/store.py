@@ -0,0 +1,335 @@
+"""Compact on-disk sample store for the Toon boilerstatus component."""
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import slugify
+
+from .const import STORE_RESOLUTIONS, STORE_RETENTION
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"TBS2"
+
+FLUSH_INTERVAL = timedelta(minutes=1)
+COMPACT_INTERVAL = timedelta(hours=1)
+# Records are only dropped once this many seconds have expired, as dropping
+# them rewrites the whole file.
+TRIM_SPAN = 86400
+
+
+class _RecordFile:
+    """Append-only file of fixed-size records sorted by timestamp.
+
+    The file starts with a header holding the field names, followed by
+    records of a float64 timestamp, the float64 sampleTime of the Toon and
+    one float32 per field. Records are (timestamp, sample_time, values)
+    tuples, with NaN for a missing sample time or value.
+    """
+
+    def __init__(self, path, keys):
+        """Initialize the file description."""
+
+        self.path = path
+        self._struct = struct.Struct(f"<dd{len(keys)}f")
+        self.record_size = self._struct.size
+        names = json.dumps(list(keys)).encode()
+        self._header = MAGIC + struct.pack("<I", len(names)) + names
+
+    def open(self):
+        """Create the file, or start a new one if its fields do not match."""
+
+        try:
+            with open(self.path, "rb") as file:
+                header = file.read(len(self._header))
+        except FileNotFoundError:
+            header = None
+        if header != self._header:
+            if header is not None:
+                _LOGGER.warning("Fields of %s changed, starting a new file", self.path)
+                os.replace(self.path, f"{self.path}.old")
+            with open(self.path, "wb") as file:
+                file.write(self._header)
+            return
+        # Drop a partially written record left by an interrupted append.
+        size = os.path.getsize(self.path)
+        if extra := (size - len(self._header)) % self.record_size:
+            os.truncate(self.path, size - extra)
+
+    def append(self, records):
+        """Append (timestamp, sample_time, values) records."""
+
+        if records:
+            pack = self._struct.pack
+            data = b"".join(
+                pack(timestamp, sample_time, *values)
+                for timestamp, sample_time, values in records
+            )
+            with open(self.path, "ab") as file:
+                file.write(data)
+
+    def _bisect(self, view, count, timestamp):
+        """Return the index of the first record at or after timestamp."""
+
+        low, high = 0, count
+        offset, size = len(self._header), self.record_size
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from("<d", view, offset + middle * size)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def read(self, start, end, limit=None):
+        """Return the records with start <= timestamp < end.
+
+        At most limit records are returned when limit is given.
+        """
+
+        with open(self.path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as view:
+            offset, size = len(self._header), self.record_size
+            count = (len(view) - offset) // size
+            first = self._bisect(view, count, start)
+            last = self._bisect(view, count, end)
+            if limit is not None:
+                last = min(last, first + limit)
+            unpack = self._struct.unpack_from
+            records = []
+            for index in range(first, last):
+                timestamp, sample_time, *values = unpack(view, offset + index * size)
+                records.append((timestamp, sample_time, values))
+            return records
+
+    def last_timestamp(self):
+        """Return the timestamp of the last record, or None if empty."""
+
+        size = os.path.getsize(self.path)
+        if size - len(self._header) < self.record_size:
+            return None
+        with open(self.path, "rb") as file:
+            file.seek(size - self.record_size)
+            return struct.unpack("<d", file.read(8))[0]
+
+    def trim(self, before):
+        """Drop the records older than before once TRIM_SPAN of them expired."""
+
+        offset = len(self._header)
+        if os.path.getsize(self.path) - offset < self.record_size:
+            return
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            if struct.unpack("<d", file.read(8))[0] > before - TRIM_SPAN:
+                return
+        with open(self.path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as view:
+            count = (len(view) - offset) // self.record_size
+            first = self._bisect(view, count, before)
+            if not first:
+                return
+            tail = view[offset + first * self.record_size :]
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self._header)
+            file.write(tail)
+        os.replace(temp_path, self.path)
+
+
+def _downsample(records, bucket_size):
+    """Average records per bucket, ignoring missing (NaN) values.
+
+    A bucket keeps the latest sample time of its records.
+    """
+
+    result = []
+    bucket_start = None
+    sums = counts = None
+    for timestamp, sample_time, values in records:
+        start = timestamp - timestamp % bucket_size
+        if start != bucket_start:
+            if bucket_start is not None:
+                result.append((bucket_start, bucket_sample_time, _means(sums, counts)))
+            bucket_start = start
+            bucket_sample_time = math.nan
+            sums = [0.0] * len(values)
+            counts = [0] * len(values)
+        if not math.isnan(sample_time):
+            bucket_sample_time = sample_time
+        for index, value in enumerate(values):
+            if not math.isnan(value):
+                sums[index] += value
+                counts[index] += 1
+    if bucket_start is not None:
+        result.append((bucket_start, bucket_sample_time, _means(sums, counts)))
+    return result
+
+
+def _means(sums, counts):
+    return [total / count if count else math.nan for total, count in zip(sums, counts)]
+
+
+class SampleStore:
+    """On-disk history of a single Toon at raw, 1 minute and 1 hour resolution.
+
+    Samples are buffered in memory and appended to the raw file once a
+    minute. An hourly compaction downsamples complete buckets into the
+    coarser files and drops data older than its retention. All file access
+    runs in the executor.
+    """
+
+    def __init__(self, directory, name, keys):
+        """Initialize the store for the given snapshot keys."""
+
+        self.keys = tuple(keys)
+        self._directory = directory
+        base = os.path.join(directory, slugify(name))
+        self._files = {
+            resolution: _RecordFile(f"{base}.{resolution}.bin", self.keys)
+            for resolution in STORE_RESOLUTIONS
+        }
+        self._pending = []
+        self._lock = threading.Lock()
+        self._opened = False
+
+    def add(self, timestamp, snapshot):
+        """Buffer a snapshot until the next flush."""
+
+        values = tuple(
+            math.nan if (value := snapshot.get(key)) is None else value
+            for key in self.keys
+        )
+        sample_time = snapshot.sample_time
+        self._pending.append(
+            (
+                timestamp,
+                math.nan if sample_time is None else sample_time.timestamp(),
+                values,
+            )
+        )
+
+    def _ensure_open(self):
+        if not self._opened:
+            os.makedirs(self._directory, exist_ok=True)
+            for record_file in self._files.values():
+                record_file.open()
+            self._opened = True
+
+    def _write(self, records):
+        with self._lock:
+            self._ensure_open()
+            self._files["raw"].append(records)
+
+    def _compact(self, now):
+        with self._lock:
+            self._ensure_open()
+            for source, target in (("raw", "1m"), ("1m", "1h")):
+                bucket_size = STORE_RESOLUTIONS[target]
+                last = self._files[target].last_timestamp()
+                start = -math.inf if last is None else last + bucket_size
+                # Only complete buckets are written.
+                end = now - now % bucket_size
+                records = self._files[source].read(start, end)
+                self._files[target].append(_downsample(records, bucket_size))
+            for resolution, retention in STORE_RETENTION.items():
+                if retention is not None:
+                    self._files[resolution].trim(now - retention)
+
+    def _query(self, start, end, resolution):
+        with self._lock:
+            self._ensure_open()
+            return self._files[resolution].read(start, end)
+
+    def iter_records(self, start, end, resolution, chunk_size):
+        """Yield the records in a time range in chunks of chunk_size.
+
+        The lock is only held while a chunk is read, so flushing and
+        compaction can go on during a long export. Must run in the executor.
+        """
+
+        while True:
+            with self._lock:
+                self._ensure_open()
+                records = self._files[resolution].read(start, end, chunk_size)
+            if not records:
+                return
+            yield records
+            if len(records) < chunk_size:
+                return
+            start = math.nextafter(records[-1][0], math.inf)
+
+    async def async_flush(self, hass):
+        """Append the buffered samples to the raw file."""
+
+        if self._pending:
+            records, self._pending = self._pending, []
+            await hass.async_add_executor_job(self._write, records)
+
+    async def async_compact(self, hass):
+        """Downsample into the coarser files and apply the retention."""
+
+        await self.async_flush(hass)
+        await hass.async_add_executor_job(self._compact, time.time())
+
+    async def async_query(self, hass, start, end, resolution):
+        """Return the records between two epoch timestamps as columns."""
+
+        await self.async_flush(hass)
+        records = await hass.async_add_executor_job(
+            self._query, start, end, resolution
+        )
+        result = {
+            "timestamp": [timestamp for timestamp, _sample_time, _values in records],
+            "sample_time": [
+                None if math.isnan(sample_time) else sample_time
+                for _timestamp, sample_time, _values in records
+            ],
+        }
+        for index, key in enumerate(self.keys):
+            result[key] = [
+                None if math.isnan(values[index]) else round(values[index], 3)
+                for _timestamp, _sample_time, values in records
+            ]
+        return result
+
+    @callback
+    def async_start(self, hass):
+        """Start the flush and compaction timers and return a stop callback."""
+
+        async def _async_flush(_now):
+            await self.async_flush(hass)
+
+        async def _async_compact(_now):
+            await self.async_compact(hass)
+
+        async def _async_final_write(_event):
+            if remove_final_write in unsubs:
+                unsubs.remove(remove_final_write)
+            await self.async_flush(hass)
+
+        remove_final_write = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, _async_final_write
+        )
+        unsubs = [
+            async_track_time_interval(hass, _async_flush, FLUSH_INTERVAL),
+            async_track_time_interval(hass, _async_compact, COMPACT_INTERVAL),
+            remove_final_write,
+        ]
+
+        @callback
+        def _async_stop():
+            while unsubs:
+                unsubs.pop()()
+
+        return _async_stop